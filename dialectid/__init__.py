@@ -23,4 +23,13 @@
 __version__ = '0.2.0'
 
 # from dialectid.text_repr import BoW, SeqTM
-from dialectid.model import DialectId, BoW
+
+
+def __getattr__(name):
+    """DialectId and BoW are imported on first use, so that
+    importing the inference-only modules (e.g., :py:mod:`dialectid.lite`)
+    does not import scikit-learn."""
+    if name in ('DialectId', 'BoW'):
+        from dialectid import model
+        return getattr(model, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
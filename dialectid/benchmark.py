@@ -0,0 +1,314 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from time import perf_counter
+import json
+import platform
+import sys
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.utils import batches
+
+
+def peak_rss():
+    """Peak resident set size (bytes) of the process; None when
+    it is not available (e.g., Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return rss
+    return rss * 1024
+
+
+def synthetic_corpus(model: DialectId, size: int=1024,
+                     min_words: int=5, max_words: int=20,
+                     seed: int=0):
+    """Texts made of words sampled from the model's vocabulary; it
+    does not need any dataset besides the model."""
+    words = [k for k in model.seqTM.token2id
+             if k[:2] != 'q:' and '~' not in k]
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(min_words, max_words + 1, size=size)
+    index = rng.integers(len(words), size=lengths.sum())
+    output = []
+    start = 0
+    for length in lengths:
+        output.append(' '.join([words[i] for i in index[start:start + length]]))
+        start += length
+    return output
+
+
+def load_time(lang: str='es', filename: str=None, **kwargs):
+    """Seconds to load a model, i.e., weights and vocabulary;
+    `filename` is a binary model (see :py:mod:`dialectid.binary`)"""
+    start = perf_counter()
+    if filename is None:
+        model = DialectId(lang=lang, **kwargs)
+        model.weights
+        model.seqTM
+    else:
+        from dialectid.binary import load
+        model = load(filename, **kwargs)
+    return perf_counter() - start
+
+
+def throughput(model: DialectId, texts: list,
+               methods: list=['transform', 'predict', 'positive'],
+               batch_sizes: list=[1, 32, 1024]):
+    """Texts per second of each method and batch size"""
+    output = []
+    for method in methods:
+        func = getattr(model, method)
+        for batch_size in batch_sizes:
+            start = perf_counter()
+            for batch in batches(texts, batch_size=batch_size):
+                func(batch)
+            elapsed = perf_counter() - start
+            output.append(dict(method=method, batch_size=batch_size,
+                               seconds=elapsed,
+                               throughput=len(texts) / elapsed))
+    return output
+
+
+def latency(model: DialectId, texts: list,
+            method: str='predict'):
+    """Single-text latency (milliseconds); p50, p99, and max"""
+    func = getattr(model, method)
+    times = []
+    for text in texts:
+        start = perf_counter()
+        func([text])
+        times.append(perf_counter() - start)
+    times = np.array(times) * 1000
+    return dict(method=method, n=len(times),
+                p50=float(np.percentile(times, 50)),
+                p99=float(np.percentile(times, 99)),
+                max=float(times.max()))
+
+
+def allocations(model: DialectId, texts: list,
+                methods: list=['decision_function', 'predict_proba', 'positive'],
+                batch_size: int=1024):
+    """Memory (bytes) allocated by :py:mod:`tracemalloc` while computing
+    each method from the transformed texts, i.e., the helper functions
+    (e.g., `_predict_proba`); `temporaries` is the peak minus the output."""
+    import tracemalloc
+    X = model.transform(texts[:batch_size])
+    output = []
+    for method in methods:
+        if method == 'positive':
+            func = model._positive_csr
+        else:
+            func = getattr(model, f'_{method}')
+        func(X)
+        tracemalloc.start()
+        try:
+            res = func(X)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        if not isinstance(res, tuple):
+            res = (res, )
+        nbytes = sum(x.nbytes for x in res)
+        output.append(dict(method=method, batch_size=X.shape[0],
+                           peak=peak, temporaries=max(peak - nbytes, 0)))
+    return output
+
+
+def training_time(D: list, sizes: list=[1000, 10000],
+                  seed: int=0, **kwargs):
+    """Seconds of :py:func:`DialectId.tailored` for different
+    dataset sizes; `D` is a list of dict with text and klass."""
+    import os
+    from tempfile import mkdtemp
+    from shutil import rmtree
+    rng = np.random.default_rng(seed)
+    output = []
+    for size in sizes:
+        size = min(size, len(D))
+        index = rng.permutation(len(D))[:size]
+        data = [D[i] for i in index]
+        path = mkdtemp()
+        model = DialectId(pretrained=False, use_tqdm=False, **kwargs)
+        start = perf_counter()
+        model.tailored(data, filename=os.path.join(path, 'model.json.gz'),
+                       tsv_filename=os.path.join(path, 'model.tsv'),
+                       self_supervised=False)
+        output.append(dict(size=size, seconds=perf_counter() - start))
+        rmtree(path)
+    return output
+
+
+def hashing_tradeoff(D: list, Dtest: list,
+                     configs: list=[dict(n_buckets=2**16),
+                                    dict(n_buckets=2**16, n_components=2**10)],
+                     batch_size: int=1024, **kwargs):
+    """Accuracy, throughput (predict's texts per second), memory
+    (see :py:func:`dialectid.router.model_memory`), and training time
+    of the hashed feature modes against the exact vocabulary; each
+    model is trained with :py:func:`DialectId.tailored` on `D` and
+    evaluated on `Dtest`.
+
+    :param D: Training set (list of dict with text and klass)
+    :param Dtest: Test set
+    :param configs: DialectId parameters of the hashed models, i.e., n_buckets and n_components
+    :param kwargs: DialectId parameters, e.g., `lang`
+    """
+    import os
+    from tempfile import mkdtemp
+    from shutil import rmtree
+    from dialectid.router import model_memory
+    texts = [x['text'] for x in Dtest]
+    y = np.array([x['klass'] for x in Dtest])
+    output = []
+    for config in [dict(n_buckets=None, n_components=None)] + list(configs):
+        path = mkdtemp()
+        model = DialectId(pretrained=False, use_tqdm=False,
+                          **config, **kwargs)
+        start = perf_counter()
+        model.tailored(D, filename=os.path.join(path, 'model.json.gz'),
+                       tsv_filename=os.path.join(path, 'model.tsv'),
+                       self_supervised=False)
+        seconds = perf_counter() - start
+        hy = model.predict(texts)
+        _ = throughput(model, texts, methods=['predict'],
+                       batch_sizes=[batch_size])[0]
+        output.append(dict(n_buckets=model.n_buckets,
+                           n_components=model.n_components,
+                           accuracy=float((hy == y).mean()),
+                           throughput=_['throughput'],
+                           memory=model_memory(model),
+                           training=seconds))
+        rmtree(path)
+    return output
+
+
+def run(langs: list=['es'], size: int=1024,
+        batch_sizes: list=[1, 32, 1024],
+        methods: list=['transform', 'predict', 'predict_proba', 'positive'],
+        latency_size: int=200, filename: str=None,
+        D: list=None, training_sizes: list=[1000, 10000],
+        hashing: list=None, **kwargs):
+    """Run the benchmark suite; the output can be stored
+    as JSON to compare versions.
+
+    :param langs: Languages
+    :param size: Number of synthetic texts
+    :param filename: JSON-lines file with the texts, instead of the synthetic corpus
+    :param D: Labeled dataset used to measure the training time; skipped when None
+    :param hashing: Hashed feature modes compared against the exact vocabulary on a split of D (see :py:func:`hashing_tradeoff`)
+
+    The model is loaded and warmed up before timing it. `memory` is the
+    model's memory (see :py:func:`dialectid.router.model_memory`), whereas
+    `peak_rss` is the process's peak so far, i.e., it includes the
+    languages benchmarked before.
+    """
+    import dialectid
+    from dialectid.router import model_memory
+    output = dict(version=dialectid.__version__,
+                  python=platform.python_version(),
+                  numpy=np.__version__,
+                  platform=platform.platform(),
+                  results={})
+    for lang in langs:
+        res = dict(load=load_time(lang=lang, **kwargs))
+        model = DialectId(lang=lang, use_tqdm=False, **kwargs)
+        if filename is None:
+            texts = synthetic_corpus(model, size=size)
+        else:
+            from microtc.utils import tweet_iterator
+            texts = [x['text'] for x in tweet_iterator(filename)][:size]
+        model.weights
+        model.predict(texts[:1])
+        res['memory'] = model_memory(model)
+        _ = [x for x in methods if x != 'predict_proba' or model.probability]
+        res['throughput'] = throughput(model, texts, methods=_,
+                                       batch_sizes=batch_sizes)
+        res['latency'] = latency(model, texts[:latency_size])
+        _ = [x for x in ['decision_function', 'predict_proba', 'positive']
+             if x != 'predict_proba' or model.probability]
+        res['allocations'] = allocations(model, texts, methods=_,
+                                         batch_size=max(batch_sizes))
+        if D is not None:
+            res['training'] = training_time(D, sizes=training_sizes,
+                                            lang=lang)
+        if D is not None and hashing is not None:
+            index = np.random.default_rng(0).permutation(len(D))
+            size_test = len(D) // 5
+            Dtest = [D[i] for i in index[:size_test]]
+            Dtrain = [D[i] for i in index[size_test:]]
+            res['hashing'] = hashing_tradeoff(Dtrain, Dtest,
+                                              configs=hashing, lang=lang)
+        res['peak_rss'] = peak_rss()
+        output['results'][lang] = res
+    return output
+
+
+def main(args=None):
+    """Command line interface"""
+    import argparse
+    parser = argparse.ArgumentParser(description='DialectId benchmark')
+    parser.add_argument('-l', '--lang', nargs='+', default=['es'], dest='langs')
+    parser.add_argument('-n', '--size', type=int, default=1024)
+    parser.add_argument('-b', '--batch-size', type=int, nargs='+',
+                        default=[1, 32, 1024], dest='batch_sizes')
+    parser.add_argument('--texts', default=None,
+                        help='JSON-lines file with the texts; default synthetic texts')
+    parser.add_argument('--training', default=None,
+                        help='JSON-lines file with text and klass to measure tailored')
+    parser.add_argument('--training-sizes', type=int, nargs='+',
+                        default=[1000, 10000], dest='training_sizes')
+    parser.add_argument('--hashing', type=int, nargs='+', default=None,
+                        help='number of buckets of the hashed models compared on --training')
+    parser.add_argument('--components', type=int, default=None,
+                        help='dimension of the projection of the hashed models')
+    parser.add_argument('--probability', action='store_true')
+    parser.add_argument('-o', '--output', default=None,
+                        help='JSON output; default stdout')
+    args = parser.parse_args(args)
+    D = None
+    if args.training is not None:
+        from microtc.utils import tweet_iterator
+        D = list(tweet_iterator(args.training))
+    hashing = None
+    if args.hashing is not None:
+        hashing = [dict(n_buckets=n, n_components=args.components)
+                   for n in args.hashing]
+    output = run(langs=args.langs, size=args.size,
+                 batch_sizes=args.batch_sizes,
+                 filename=args.texts, D=D,
+                 training_sizes=args.training_sizes,
+                 hashing=hashing,
+                 probability=args.probability)
+    if args.output is None:
+        print(json.dumps(output, indent=2))
+        return
+    with open(args.output, 'w', encoding='utf-8') as fpt:
+        json.dump(output, fpt, indent=2)
+
+
+if __name__ == '__main__':
+    main()
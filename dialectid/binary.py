@@ -0,0 +1,236 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+import os
+import json
+from os.path import isfile
+import numpy as np
+
+MAGIC = b'DIALID01'
+ALIGN = 64
+
+
+def _align(offset: int):
+    """Next offset aligned to :py:attr:`ALIGN`"""
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def encode_strings(strings: list):
+    """Strings into a utf-8 blob and their offsets"""
+    data = [bytes(x, encoding='utf-8') for x in strings]
+    offsets = np.zeros(len(data) + 1, dtype=np.int64)
+    np.cumsum([len(x) for x in data], out=offsets[1:])
+    return np.frombuffer(b''.join(data), dtype=np.uint8), offsets
+
+
+def decode_strings(blob: np.ndarray, offsets: np.ndarray):
+    """Inverse of :py:func:`encode_strings`"""
+    blob = blob.tobytes()
+    offsets = offsets.tolist()
+    return [blob[a:b].decode('utf-8')
+            for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def _vocabulary(bow):
+    """Tokens sorted by their identifier and their weights; the
+    hashed vocabulary does not store the tokens"""
+    if getattr(bow, 'n_buckets', None) is not None:
+        return [], np.asanyarray(bow.weights, dtype=bow.precision)
+    tokens = [None] * bow.num_terms
+    for k, v in bow.token2id.items():
+        tokens[v] = k
+    return tokens, np.asanyarray(bow.weights, dtype=bow.precision)
+
+
+def save(model, filename: str):
+    """Store `model` in the binary format; the file is
+    a header followed by the arrays aligned to :py:attr:`ALIGN` bytes.
+
+    :param model: DialectId
+    :param filename: Output filename
+    """
+    weights = np.ascontiguousarray(model.weights)
+    arrays = dict(weights=weights,
+                  names=np.asarray(model.names).astype(str))
+    if model.scale is not None:
+        arrays['scale'] = np.ascontiguousarray(model.scale)
+    if model.with_intercept:
+        arrays['intercept'] = np.ascontiguousarray(model.intercept)
+    try:
+        coef, intercept = model.proba_coefs
+        arrays['proba_coef'] = np.ascontiguousarray(coef)
+        arrays['proba_intercept'] = np.ascontiguousarray(intercept)
+    except AttributeError:
+        pass
+    bow = model.seqTM
+    tokens, idf = _vocabulary(bow)
+    arrays['tokens'], arrays['tokens_offsets'] = encode_strings(tokens)
+    arrays['idf'] = idf
+    header = dict(params=model.get_params(),
+                  bow=dict(lang=bow.lang, del_diac=bow.del_diac,
+                           token_max_filter=bow.token_max_filter,
+                           update_calls=bow.model.N,
+                           params=bow.get_params()),
+                  arrays={})
+    # the offsets depend on the header size and vice versa
+    size = -1
+    while True:
+        offset = _align(len(MAGIC) + 8 + max(size, 0))
+        for key, value in arrays.items():
+            header['arrays'][key] = dict(dtype=value.dtype.str,
+                                         shape=list(value.shape),
+                                         offset=offset)
+            offset = _align(offset + value.nbytes)
+        _ = bytes(json.dumps(header), encoding='utf-8')
+        if len(_) == size:
+            break
+        size = len(_)
+    tmp = f'{filename}.tmp'
+    with open(tmp, 'wb') as fpt:
+        fpt.write(MAGIC)
+        fpt.write(np.uint64(len(_)).tobytes())
+        fpt.write(_)
+        for key, value in arrays.items():
+            fpt.seek(header['arrays'][key]['offset'])
+            fpt.write(value.tobytes())
+        fpt.truncate(offset)
+    os.replace(tmp, filename)
+
+
+def read_header(filename: str):
+    """Header of a binary model"""
+    with open(filename, 'rb') as fpt:
+        assert fpt.read(len(MAGIC)) == MAGIC, f'{filename} is not a DialectId binary'
+        size = int(np.frombuffer(fpt.read(8), dtype=np.uint64)[0])
+        return json.loads(fpt.read(size))
+
+
+def read_arrays(filename: str, mmap: bool=True):
+    """Header and arrays of a binary model; the arrays are
+    memory-mapped read-only when `mmap` is True."""
+    header = read_header(filename)
+    arrays = {}
+    for key, value in header['arrays'].items():
+        shape = tuple(value['shape'])
+        if mmap and np.prod(shape) > 0:
+            arrays[key] = np.memmap(filename, mode='r',
+                                    dtype=np.dtype(value['dtype']),
+                                    offset=value['offset'], shape=shape)
+            continue
+        count = int(np.prod(shape))
+        arrays[key] = np.fromfile(filename, dtype=np.dtype(value['dtype']),
+                                  count=count,
+                                  offset=value['offset']).reshape(shape)
+    return header, arrays
+
+
+def load(filename: str, mmap: bool=True, **kwargs):
+    """Load a model stored with :py:func:`save`; the arrays are
+    memory-mapped read-only so that processes share the pages.
+
+    :param filename: Binary model
+    :param mmap: Memory-map the arrays, otherwise they are read into memory
+    :param kwargs: Parameters that replace the stored ones, e.g., `probability`
+    """
+    from microtc.weighting import TFIDF
+    from dialectid.model import DialectId, BoW
+    from dialectid.hashing import HashedTFIDF
+    header, arrays = read_arrays(filename, mmap=mmap)
+    params = header['params']
+    params.update(kwargs)
+    model = DialectId(**params)
+    bow_params = header['bow']
+    _ = dict(bow_params.get('params', dict(lang=bow_params['lang'],
+                                           del_diac=bow_params['del_diac'],
+                                           token_max_filter=bow_params['token_max_filter'])))
+    _['pretrained'] = False
+    bow = BoW(**_)
+    if bow.n_buckets is None:
+        tokens = decode_strings(arrays['tokens'], arrays['tokens_offsets'])
+        tfidf = TFIDF()
+        tfidf.word2id = {k: v for v, k in enumerate(tokens)}
+    else:
+        tfidf = HashedTFIDF(bow.n_buckets, n_components=bow.n_components,
+                            n_nonzero=bow.n_nonzero, seed=bow.hash_seed)
+    # TFIDF indexes the weights by the token's identifier, so
+    # the (memory-mapped) array replaces microtc's dict
+    tfidf._weight = arrays['idf']
+    tfidf.N = bow_params['update_calls']
+    bow.model = tfidf
+    bow.pretrained = True
+    bow.weights = arrays['idf']
+    model.seqTM = bow
+    model.names = np.array(arrays['names'])
+    model.weights = arrays['weights']
+    if 'scale' in arrays:
+        model.scale = arrays['scale']
+    if 'intercept' in arrays:
+        model.intercept = arrays['intercept']
+    if 'proba_coef' in arrays:
+        model.proba_coefs = (arrays['proba_coef'],
+                             arrays['proba_intercept'])
+    return model
+
+
+def convert(filename: str, output: str=None, **kwargs):
+    """Convert a model stored as json.gz (e.g., the output of
+    :py:func:`DialectId.tailored` or :py:func:`DialectId.download`)
+    into the binary format.
+
+    :param filename: Model in json.gz
+    :param output: Binary filename; default replaces .json.gz by .dialectid
+    :param kwargs: DialectId parameters, e.g., `lang`
+
+    >>> from dialectid.binary import convert, load
+    >>> convert('DialectId_c69aaba0f1b0783f273f85de6f599132.json.gz',
+    ...         'es.dialectid', lang='es')  # doctest: +SKIP
+    >>> detect = load('es.dialectid')  # doctest: +SKIP
+    """
+    from microtc.utils import tweet_iterator
+    from dialectid.model import DialectId
+    assert isfile(filename)
+    if output is None:
+        output = filename.split('.json.gz')[0] + '.dialectid'
+    kwargs['pretrained'] = False
+    model = DialectId(**kwargs)
+    model.set_weights(tweet_iterator(filename))
+    model.pretrained = True
+    save(model, output)
+    return output
+
+
+def main(args=None):
+    """Command line interface to :py:func:`convert`"""
+    import argparse
+    parser = argparse.ArgumentParser(description='Convert a DialectId json.gz model into the binary format')
+    parser.add_argument('filename', help='json.gz model')
+    parser.add_argument('-o', '--output', default=None, help='output filename')
+    parser.add_argument('-l', '--lang', default='es', help='language')
+    parser.add_argument('--probability', action='store_true')
+    args = parser.parse_args(args)
+    print(convert(args.filename, output=args.output,
+                  lang=args.lang, probability=args.probability))
+
+
+if __name__ == '__main__':
+    main()
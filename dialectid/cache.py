@@ -0,0 +1,119 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from typing import Callable
+from collections import OrderedDict
+import hashlib
+import numpy as np
+
+
+class Cache:
+    """LRU cache of the rows computed by :py:func:`DialectId.transform`;
+    the key is a hash of the text's content. It is bounded by the number
+    of entries and, optionally, by the bytes used by the rows.
+
+    :param max_entries: Maximum number of rows
+    :param max_bytes: Maximum number of bytes
+
+    >>> from dialectid import DialectId
+    >>> from dialectid.cache import Cache
+    >>> dialectid = DialectId(lang='es')
+    >>> dialectid.cache = Cache(max_entries=2**16)
+    >>> _ = dialectid.positive(['comiendo tacos', 'comiendo tacos'])  # doctest: +SKIP
+    >>> dialectid.cache.hits, dialectid.cache.misses  # doctest: +SKIP
+    (1, 1)
+    """
+
+    def __init__(self, max_entries: int=2**16,
+                 max_bytes: int=None,
+                 text: str='text'):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.text = text
+        self.clear()
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        self.data = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def key(self, text):
+        """Content hash"""
+        if isinstance(text, dict):
+            text = text[self.text]
+        return hashlib.blake2b(bytes(text, encoding='utf-8'),
+                               digest_size=16).digest()
+
+    def get(self, key: bytes):
+        """Row associated to `key` or None"""
+        try:
+            self.data.move_to_end(key)
+        except KeyError:
+            return None
+        return self.data[key]
+
+    def put(self, key: bytes, row: np.ndarray):
+        """Store `row`, evicting the least recently used entries"""
+        if key in self.data:
+            return
+        self.data[key] = row
+        self.nbytes += row.nbytes
+        while len(self.data) > self.max_entries or (self.max_bytes is not None and
+                                                    self.nbytes > self.max_bytes):
+            _, value = self.data.popitem(last=False)
+            self.nbytes -= value.nbytes
+
+    def transform(self, function: Callable, texts: list):
+        """Transform `texts` with `function` computing only once each
+        text that is not in the cache"""
+        keys = [self.key(text) for text in texts]
+        position = {}
+        rows = []
+        pending = []
+        for key, text in zip(keys, texts):
+            if key in position:
+                continue
+            position[key] = len(rows)
+            row = self.get(key)
+            if row is None:
+                pending.append((len(rows), key, text))
+            rows.append(row)
+        if len(pending):
+            X = function([text for _, _, text in pending])
+            for (index, key, _), row in zip(pending, X):
+                row = row.copy()
+                rows[index] = row
+                self.put(key, row)
+        self.misses += len(pending)
+        self.hits += len(keys) - len(pending)
+        return np.vstack([rows[position[key]] for key in keys])
+
+    def stats(self):
+        """Counters"""
+        return dict(hits=self.hits, misses=self.misses,
+                    entries=len(self), nbytes=self.nbytes)
@@ -0,0 +1,182 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from zlib import crc32
+import numpy as np
+from microtc.weighting import TFIDF
+
+
+class _Buckets(dict):
+    """Buckets of the tokens seen, at most `max_size`"""
+
+    def __init__(self, n_buckets: int, seed: int, max_size: int):
+        super().__init__()
+        self.n_buckets = n_buckets
+        self.seed = seed
+        self.max_size = max_size
+
+    def __missing__(self, token: str):
+        bucket = crc32(token.encode('utf-8'), self.seed) % self.n_buckets
+        if len(self) < self.max_size:
+            self[token] = bucket
+        return bucket
+
+
+class HashedVocabulary:
+    """Token to bucket (hashing trick); it works as the vocabulary's
+    dictionary without storing the tokens, i.e., every token has an identifier.
+    The buckets of the first `cache_size` tokens are memoized.
+
+    :param n_buckets: Number of buckets
+    :param seed: Seed of the hash function (CRC-32)
+    :param cache_size: Maximum number of memoized tokens
+
+    >>> from dialectid.hashing import HashedVocabulary
+    >>> vocabulary = HashedVocabulary(2**10)
+    >>> vocabulary['tacos']
+    995
+    """
+
+    def __init__(self, n_buckets: int, seed: int=0,
+                 cache_size: int=2**14):
+        self.n_buckets = n_buckets
+        self.seed = seed
+        self._cache = _Buckets(n_buckets, seed, cache_size)
+
+    @property
+    def get(self):
+        """Function that returns the bucket of a token"""
+        return self._cache.__getitem__
+
+    def __getitem__(self, token: str):
+        return self._cache[token]
+
+    def __contains__(self, token: str):
+        return True
+
+    def __len__(self):
+        return self.n_buckets
+
+    def __iter__(self):
+        return iter(self._cache)
+
+    def items(self):
+        """Memoized tokens and their buckets"""
+        return self._cache.items()
+
+
+def sparse_projection(n_buckets: int, n_components: int,
+                      n_nonzero: int=4, seed: int=0):
+    """Sparse random projection (`n_buckets` x `n_components`); each
+    row has `n_nonzero` entries equal to :math:`\\pm 1/\\sqrt{n\\_nonzero}`
+    in random columns. It is generated from `seed`, so it is not stored."""
+    from scipy.sparse import csr_matrix
+    rng = np.random.default_rng(seed)
+    size = n_buckets * n_nonzero
+    cols = rng.integers(n_components, size=size)
+    data = rng.choice(np.array([-1, 1], dtype=np.float32), size=size)
+    data /= np.sqrt(n_nonzero)
+    indptr = np.arange(0, size + 1, n_nonzero)
+    output = csr_matrix((data, cols, indptr),
+                        shape=(n_buckets, n_components))
+    output.sum_duplicates()
+    return output
+
+
+class HashedTFIDF(TFIDF):
+    """TFIDF on the hashed tokens (see :py:class:`HashedVocabulary`);
+    the document frequency of a bucket is the sum of the frequencies
+    of its tokens. When `n_components` is given, the vectors are
+    projected with :py:func:`sparse_projection`.
+
+    :param n_buckets: Number of buckets
+    :param n_components: Dimension of the projection; None disables it
+    :param n_nonzero: Non-zero entries of each row of the projection
+    :param seed: Seed of the hash function and the projection
+    """
+
+    def __init__(self, n_buckets: int, n_components: int=None,
+                 n_nonzero: int=4, seed: int=0):
+        super().__init__()
+        self.n_components = n_components
+        self.n_nonzero = n_nonzero
+        self.seed = seed
+        self.word2id = HashedVocabulary(n_buckets, seed=seed)
+
+    @property
+    def n_buckets(self):
+        """Number of buckets"""
+        return self.word2id.n_buckets
+
+    @property
+    def num_terms(self):
+        """Dimension of the vectors"""
+        if self.n_components is None:
+            return self.n_buckets
+        return self.n_components
+
+    @property
+    def wordWeight(self):
+        """Inverse document frequency of each bucket (array)"""
+        return self._weight
+
+    def set_counter(self, counter):
+        """Buckets' weights from the vocabulary's frequencies,
+        i.e., :py:class:`microtc.utils.Counter`"""
+        N = counter.update_calls
+        vocabulary = self.word2id
+        buckets = np.fromiter((vocabulary[k] for k in counter),
+                              dtype=np.int64, count=len(counter))
+        freq = np.fromiter(counter.values(), dtype=np.float64,
+                           count=len(counter))
+        df = np.bincount(buckets, weights=freq,
+                         minlength=self.n_buckets)
+        self.N = N
+        self._weight = np.log2(N / np.clip(df, 1, N))
+        return self
+
+    @property
+    def projection(self):
+        """Sparse random projection (see :py:func:`sparse_projection`)"""
+        try:
+            return self._projection
+        except AttributeError:
+            self._projection = sparse_projection(self.n_buckets,
+                                                 self.n_components,
+                                                 n_nonzero=self.n_nonzero,
+                                                 seed=self.seed)
+        return self._projection
+
+    def fold(self, weights: np.ndarray):
+        """Weights of the buckets given the weights of the projection"""
+        return self.projection @ weights
+
+    def __getitem__(self, tokens):
+        output = super().__getitem__(tokens)
+        if self.n_components is None or len(output) == 0:
+            return output
+        ids = [i for i, _ in output]
+        values = np.array([v for _, v in output])
+        vec = self.projection[ids].T @ values
+        index = np.flatnonzero(vec)
+        return list(zip(index.tolist(), vec[index].tolist()))
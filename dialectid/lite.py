@@ -0,0 +1,778 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from typing import Iterable
+from unicodedata import normalize as unicode_normalize
+import gzip
+import json
+import re
+import threading
+import numpy as np
+from microtc import emoticons, TextModel as microTCTM
+from microtc.params import OPTION_NONE, OPTION_GROUP
+from microtc.textmodel import SKIP_SYMBOLS
+from microtc.utils import tweet_iterator
+from dialectid.utils import batches
+from dialectid.quantize import dequantize
+from dialectid.metrics import instrumented, timer
+from dialectid.preprocess import Tokenizer
+
+NOT_LANGUAGE = 'not-this-language'
+
+
+def row_norm(X: np.ndarray, out: np.ndarray=None):
+    """l2 norm of the rows; zero rows have norm one"""
+    if out is None:
+        out = np.empty(X.shape[0], dtype=X.dtype)
+    np.einsum('ij,ij->i', X, X, out=out)
+    np.sqrt(out, out=out)
+    out[out == 0] = 1
+    return out
+
+
+def normalize(X: np.ndarray):
+    """Rows with unit length (l2)"""
+    return X / row_norm(X)[:, np.newaxis]
+
+
+def expit(X: np.ndarray, out: np.ndarray=None):
+    """Logistic function"""
+    if out is None:
+        out = np.empty_like(X)
+    np.negative(X, out=out)
+    np.exp(out, out=out)
+    out += 1
+    np.reciprocal(out, out=out)
+    return out
+
+
+def softmax(X: np.ndarray, out: np.ndarray=None):
+    """Softmax of the rows"""
+    if out is None:
+        out = np.empty_like(X)
+    np.subtract(X, X.max(axis=1, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=1, keepdims=True)
+    return out
+
+
+class TextModel(microTCTM):
+    """Tokenizer equivalent to :py:class:`dialectid.model.BoW`
+    (EncExp's TextModel) without its training dependencies"""
+
+    def __init__(self, lang: str=None, text: str='text',
+                 num_option: str=OPTION_NONE, usr_option: str=OPTION_GROUP,
+                 url_option: str=OPTION_GROUP, emo_option: str=OPTION_NONE,
+                 hashtag_option: str=OPTION_NONE, ent_option: str=OPTION_NONE,
+                 lc: bool=True, del_dup: bool=False, del_punc: bool=False,
+                 del_diac: bool=True, select_ent: bool=False, select_suff: bool=False,
+                 select_conn: bool=False, max_dimension: bool=True,
+                 unit_vector: bool=True, q_grams_words: bool=True,
+                 norm_emojis: bool=True, token_list: list=None,
+                 token_min_filter=0, token_max_filter=int(2**17),
+                 weighting: str='microtc.weighting.TFIDF',
+                 norm_punc: bool=True, pretrained=True):
+        if token_list is None:
+            if lang in ['ja', 'zh']:
+                token_list = [1, 2, 3]
+            else:
+                token_list = [-2, -1, 2, 3, 4]
+        super().__init__(text=text, num_option=num_option, usr_option=usr_option,
+                         url_option=url_option, emo_option=emo_option,
+                         hashtag_option=hashtag_option, ent_option=ent_option,
+                         lc=lc, del_dup=del_dup, del_punc=del_punc, del_diac=del_diac,
+                         select_ent=select_ent, select_suff=select_suff,
+                         select_conn=select_conn, max_dimension=max_dimension,
+                         unit_vector=unit_vector, q_grams_words=q_grams_words,
+                         norm_emojis=False, token_list=token_list,
+                         token_min_filter=token_min_filter,
+                         token_max_filter=token_max_filter, weighting=weighting)
+        self.text = self._text
+        self.lang = lang
+        self.norm_emojis = norm_emojis
+        self.norm_punc = norm_punc
+        self.pretrained = pretrained
+        self._norm_tokens()
+
+    def _norm_tokens(self):
+        """Normalize tokens"""
+        _ = ['_htag', '_ent', '_num', '_url', '_usr']
+        self.norm_tokens = {k: f'~e:{k}~' for k in _}
+        if self.norm_emojis:
+            _ = {k: f'~e:{v.replace("~", "")}~'
+                 for k, v in emoticons.read_emojis().items()}
+            self.norm_tokens.update(_)
+        if self.norm_punc:
+            _ = {k: f'~e:{k}~' for k in SKIP_SYMBOLS if k != '~'}
+            self.norm_tokens.update(_)
+        _ = {x: True for x in self.norm_tokens}
+        self.norm_head = emoticons.create_data_structure(_)
+
+    def text_transformations(self, text: str):
+        """Text transformations"""
+        text = super().text_transformations(text)
+        text = re.sub('~+', '~', text)
+        if self.del_diac:
+            return text
+        return unicode_normalize('NFD', text)
+
+    def get_word_list(self, text):
+        """Words from normalize text"""
+        data = text.split('~')
+        return data[1:-1]
+
+    def compute_q_grams_words(self, textlist):
+        """q-grams only on words"""
+        output = []
+        textlist = ['~' + x + '~' for x in textlist if x[:2] != 'e:']
+        for qsize in self.q_grams:
+            _ = qsize - 1
+            extra = [x for x in textlist if len(x) >= _]
+            qgrams = [["".join(output) for output in zip(*[text[i:] for i in range(qsize)])]
+                      for text in extra]
+            for _ in qgrams:
+                for x in _:
+                    output.append("q:" + x)
+        return output
+
+    def compute_q_grams(self, text):
+        """q-grams"""
+        output = []
+        inner = []
+        for word in self.get_word_list(text):
+            if word[:2] == 'e:':
+                if len(inner) > 0:
+                    output.extend(self.compute_q_grams_words(['~'.join(inner)]))
+                    inner = []
+                continue
+            inner.append(word)
+        if len(inner) > 0:
+            output.extend(self.compute_q_grams_words(['~'.join(inner)]))
+        return output
+
+    @property
+    def token2id(self):
+        """Token to identifier"""
+        return self._token2id
+
+    @token2id.setter
+    def token2id(self, value):
+        self._token2id = value
+
+    @property
+    def weights(self):
+        """Tokens' weights (IDF)"""
+        return self._weights
+
+    @weights.setter
+    def weights(self, value):
+        self._weights = value
+
+
+class Predictor:
+    """Predictions computed from :py:func:`transform`; it is shared
+    by :py:class:`dialectid.model.DialectId` and :py:class:`DialectIdLite`"""
+
+    @property
+    def scale(self):
+        """Per-column scale of the int8 weights"""
+        try:
+            return self._scale
+        except AttributeError:
+            return None
+
+    @scale.setter
+    def scale(self, value):
+        self._scale = value
+
+    @property
+    def metrics(self):
+        """Timers and counters (see :py:class:`dialectid.metrics.Metrics`);
+        None disables them."""
+        try:
+            return self._metrics
+        except AttributeError:
+            return None
+
+    @metrics.setter
+    def metrics(self, value):
+        self._metrics = value
+
+    @property
+    def tokenizer(self):
+        """Batch tokenizer of :py:attr:`seqTM`
+        (see :py:class:`dialectid.preprocess.Tokenizer`)"""
+        seqTM = self.seqTM
+        try:
+            tokenizer = self._tokenizer
+            if tokenizer.text_model is seqTM:
+                return tokenizer
+        except AttributeError:
+            pass
+        self._tokenizer = Tokenizer(seqTM)
+        return self._tokenizer
+
+    def token_ids_batch(self, texts: list):
+        """Identifiers of the tokens in the vocabulary and
+        the number of tokens of each text"""
+        get = self.seqTM.token2id.get
+        output = []
+        ntokens = 0
+        metrics = self.metrics
+        with timer(metrics, 'tokenize', len(texts)):
+            for tokens in self.tokenizer.tokenize_batch(texts):
+                seq = [x for x in map(get, tokens) if x is not None]
+                output.append((seq, len(tokens)))
+                ntokens += len(tokens)
+        if metrics is not None:
+            metrics.count('tokens', ntokens)
+        return output
+
+    def token_ids(self, text):
+        """Identifiers of the text's tokens in the vocabulary and
+        the number of tokens"""
+        return self.token_ids_batch([text])[0]
+
+    def _transform_texts(self, texts: Iterable):
+        """Transform the texts tokenizing them in batches"""
+        seqs = []
+        for batch in batches(texts):
+            seqs.extend([seq for seq, _ in self.token_ids_batch(batch)])
+        return self._transform_ids(seqs)
+
+    def encode(self, text):
+        """Encode utterance into a matrix; the rows of
+        the quantized weights are upcasted to `precision`."""
+        seq, _ = self.token_ids(text)
+        return self.encode_ids(seq)
+
+    def encode_ids(self, seq: list, columns: np.ndarray=None):
+        """Encode the tokens' identifiers into a matrix; `columns`
+        selects the countries (weights' columns) encoded."""
+        W = self.weights
+        scale = self.scale
+        tfidf = self.seqTM.weights
+        ncols = W.shape[1] if columns is None else len(columns)
+        if len(seq) == 0:
+            return np.ones((1, ncols), dtype=self.precision)
+        if columns is not None and scale is not None:
+            scale = scale[columns]
+        index, tf_ = np.unique(seq, return_counts=True)
+        tf = np.divide(tf_, tf_.sum(), dtype=self.precision)
+        _ = tfidf[index] * tf
+        if self.merge_encode:
+            W = W[index] if columns is None else W[np.ix_(index, columns)]
+            W = dequantize(W, scale, dtype=self.precision)
+            return W * np.c_[_ / np.linalg.norm(_)]
+        tfidf = {k: v for k, v in zip(index, _ / (np.linalg.norm(_) * tf_))}
+        W = W[seq] if columns is None else W[np.ix_(seq, columns)]
+        W = dequantize(W, scale, dtype=self.precision)
+        return W * np.c_[[tfidf[i] for i in seq]]
+
+    def _transform_ids(self, seqs: list, columns: np.ndarray=None):
+        """Transform the tokens' identifiers of each text"""
+        with timer(self.metrics, 'project', len(seqs)):
+            X = np.vstack([self.encode_ids(seq, columns=columns).sum(axis=0)
+                           for seq in seqs])
+            if self.with_intercept:
+                X = X + (self.intercept if columns is None else self.intercept[columns])
+            if self.distance:
+                X = X / (self.norm if columns is None else self.norm[columns])
+        return X
+
+    @property
+    def cascade_stats(self):
+        """Number of texts processed by :py:func:`cascade` and
+        the number of them that exited at the language gate"""
+        try:
+            return self._cascade_stats
+        except AttributeError:
+            self._cascade_stats = dict(texts=0, exits=0)
+        return self._cascade_stats
+
+    def word_coverage_batch(self, texts: list):
+        """Identifiers of the tokens in the vocabulary and the fraction of
+        the text's words in the vocabulary; the word bigrams and character
+        q-grams are excluded, the former are sparse, and the latter of any
+        text written in the same script are in the vocabulary."""
+        get = self.seqTM.token2id.get
+        seqs = []
+        coverage = np.zeros(len(texts))
+        ntokens = 0
+        metrics = self.metrics
+        with timer(metrics, 'tokenize', len(texts)):
+            for i, tokens in enumerate(self.tokenizer.tokenize_batch(texts)):
+                seq = []
+                nwords = known = 0
+                for token in tokens:
+                    ident = get(token)
+                    if ident is not None:
+                        seq.append(ident)
+                    if '~' not in token and not token.startswith('q:'):
+                        nwords += 1
+                        known += ident is not None
+                if nwords:
+                    coverage[i] = known / nwords
+                seqs.append(seq)
+                ntokens += len(tokens)
+        if metrics is not None:
+            metrics.count('tokens', ntokens)
+        return seqs, coverage
+
+    @instrumented('cascade')
+    def cascade(self, texts: list, threshold: float=0.5,
+                outputs: tuple=('predict', ),
+                margin: float=0):
+        """Predict only the texts whose fraction of words in the vocabulary
+        (language gate, see :py:func:`word_coverage_batch`) is, at least,
+        `threshold`; the rest get :py:attr:`NOT_LANGUAGE` as label, NaN scores,
+        and no positive classes. The default threshold keeps the texts
+        where most of the words are known; the vocabulary (the most frequent
+        tokens of the language) contains the common words of an in-language
+        text, whereas few words of another language are in it, e.g.,
+        proper nouns, numbers, and the users' and URLs' placeholders.
+        With the hashing trick (`n_buckets`), every token has an identifier,
+        and the gate lets all texts pass.
+
+        :param texts: Texts
+        :param threshold: Minimum fraction of words in the vocabulary
+        :param outputs: See :py:func:`predict_all`
+        :rtype: dict; it includes 'coverage' and 'gate' (texts that passed the gate)
+        """
+        seqs, coverage = self.word_coverage_batch(texts)
+        gate = coverage >= threshold
+        stats = self.cascade_stats
+        stats['texts'] += len(texts)
+        stats['exits'] += int((~gate).sum())
+        output = dict(coverage=coverage, gate=gate)
+        ncols = len(self.countries)
+        index = np.flatnonzero(gate)
+        if index.shape[0]:
+            X = self._transform_ids([seqs[i] for i in index])
+            inner = self._predict_all(X, outputs=outputs, margin=margin)
+        else:
+            inner = {}
+        for key in outputs:
+            if key == 'predict':
+                value = np.full(len(texts), NOT_LANGUAGE, dtype=object)
+            elif key == 'positive':
+                value = np.zeros((len(texts), ncols), dtype=bool)
+            else:
+                value = np.full((len(texts), ncols), np.nan)
+            if key in inner:
+                value[index] = inner[key]
+            if key == 'predict':
+                value = value.astype(str)
+            output[key] = value
+        return output
+
+    def _buffer(self, key: str, shape: tuple, dtype=np.float32):
+        """Scratch array reused across calls (one per thread); it
+        grows to the largest batch seen"""
+        try:
+            buffers = self._buffers.__dict__
+        except AttributeError:
+            self._buffers = threading.local()
+            buffers = self._buffers.__dict__
+        dtype = np.dtype(dtype)
+        buffer = buffers.get(key)
+        if buffer is None or buffer.dtype != dtype or\
+           buffer.shape[1:] != shape[1:] or buffer.shape[0] < shape[0]:
+            buffer = np.empty(shape, dtype=dtype)
+            buffers[key] = buffer
+        return buffer[:shape[0]]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_buffers', None)
+        state.pop('_metrics', None)
+        state.pop('_tokenizer', None)
+        return state
+
+    def _predict_proba(self, X: np.ndarray, out: np.ndarray=None):
+        """Predict probability helper function; the row normalization,
+        projection, intercept, and softmax (expit) are computed in `out`,
+        i.e., :math:`(X W) / \\lVert X \\rVert + b`."""
+        with timer(self.metrics, 'proba', X.shape[0]):
+            coef, intercept = self.proba_coefs
+            dtype = np.result_type(X, coef)
+            nrows = X.shape[0]
+            if out is None:
+                out = np.empty((nrows, len(self.countries)), dtype=dtype)
+            norm = row_norm(X, out=self._buffer('norm', (nrows, ), dtype=X.dtype))
+            if coef.ndim == 1:
+                res = np.matmul(X, coef, out=self._buffer('proba', (nrows, ), dtype=dtype))
+                res /= norm
+                res += intercept
+                expit(res, out=out[:, 1])
+                np.subtract(1, out[:, 1], out=out[:, 0])
+                return out
+            np.matmul(X, coef, out=out)
+            out /= norm[:, np.newaxis]
+            out += intercept
+            return softmax(out, out=out)
+
+    @instrumented('predict_proba')
+    def predict_proba(self, texts: list):
+        """Predict proba"""
+        assert self.probability
+        X = self.transform(texts)
+        return self._predict_proba(X)
+
+    def _decision_function(self, X: np.ndarray, out: np.ndarray=None):
+        """Decision function helper function; in the binary case,
+        the columns are :math:`-x` and :math:`x` (stored in `out`)."""
+        if X.shape[1] != 1:
+            return X
+        if out is None:
+            out = np.empty((X.shape[0], 2), dtype=X.dtype)
+        np.negative(X[:, 0], out=out[:, 0])
+        out[:, 1] = X[:, 0]
+        return out
+
+    @instrumented('decision_function')
+    def decision_function(self, texts: list):
+        """Decision function"""
+        X = self.transform(texts)
+        return self._decision_function(X)
+
+    def _positive_csr(self, X: np.ndarray, margin: float=0,
+                      k: int=None):
+        """Positive classes in CSR format, i.e., indptr, indices, and scores"""
+        shape = (X.shape[0], len(self.countries))
+        X_df = self._decision_function(X, out=self._buffer('df', shape, X.dtype))
+        if self.probability:
+            dtype = np.result_type(X, self.proba_coefs[0])
+            X = self._predict_proba(X, out=self._buffer('proba_out', shape, dtype))
+        else:
+            X = X_df
+        mask = np.greater(X_df, margin, out=self._buffer('mask', shape, bool))
+        if k is not None:
+            k = min(k, mask.shape[1])
+            score = self._buffer('score', shape, X.dtype)
+            score.fill(np.inf)
+            np.negative(X, out=score, where=mask)
+            top = np.argpartition(score, k - 1, axis=1)[:, :k]
+            order = np.take_along_axis(score, top, axis=1).argsort(axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_mask = np.take_along_axis(mask, top, axis=1)
+            rows = np.broadcast_to(np.arange(X.shape[0])[:, np.newaxis],
+                                   top.shape)
+            indices = top[top_mask]
+            scores = X[rows[top_mask], indices]
+            counts = top_mask.sum(axis=1)
+        else:
+            indices = np.nonzero(mask)[1]
+            scores = X[mask]
+            counts = mask.sum(axis=1)
+        indptr = np.zeros(X.shape[0] + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, indices, scores
+
+    def _positive(self, X: np.ndarray, margin: float=0,
+                  k: int=None):
+        """Positive classes helper function"""
+        indptr, indices, scores = self._positive_csr(X, margin=margin, k=k)
+        labels = [str(x) for x in self.countries]
+        output = []
+        with timer(self.metrics, 'positive_dicts', len(indptr) - 1):
+            for start, end in zip(indptr[:-1], indptr[1:]):
+                _ = {labels[i]: v
+                     for i, v in zip(indices[start:end].tolist(),
+                                     scores[start:end])}
+                output.append(_)
+        return output
+
+    @instrumented('positive')
+    def positive(self, texts: list,
+                 margin: float=0,
+                 columnar: bool=False,
+                 k: int=None):
+        """Positive classes
+
+        :param texts: Texts
+        :param margin: Minimum decision-function value
+        :param columnar: Return the CSR format, i.e., indptr, country indices, and scores
+        :param k: Keep, at most, the k positive classes with the highest scores
+        """
+        X = self.transform(texts)
+        if columnar:
+            return self._positive_csr(X, margin=margin, k=k)
+        return self._positive(X, margin=margin, k=k)
+
+    @staticmethod
+    def _top_k(X: np.ndarray, k: int=1):
+        """Indices and scores of the k highest values of each row,
+        sorted by decreasing score"""
+        k = min(k, X.shape[1])
+        if k < X.shape[1]:
+            index = np.argpartition(-X, k - 1, axis=1)[:, :k]
+        else:
+            index = np.broadcast_to(np.arange(k), X.shape)
+        scores = np.take_along_axis(X, index, axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')
+        index = np.take_along_axis(index, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        return index, scores
+
+    @instrumented('top_k')
+    def top_k(self, texts: list, k: int=1,
+              columns: np.ndarray=None):
+        """The k countries with the highest scores (probability or
+        decision function) of each text.
+
+        :param texts: Texts
+        :param k: Number of countries
+        :param columns: Countries' indices scored, e.g., :py:func:`active_columns`; the rest are pruned. The pruning skips the projection of the other countries when the scores are the decision function.
+        :rtype: tuple of indices (in :py:attr:`countries`) and scores; both texts x k
+
+        >>> from dialectid import DialectId
+        >>> detect = DialectId(lang='es')  # doctest: +SKIP
+        >>> index, scores = detect.top_k(['comiendo unos tacos'], k=2)  # doctest: +SKIP
+        >>> detect.countries[index]  # doctest: +SKIP
+        """
+        seqs = [seq for seq, _ in self.token_ids_batch(texts)]
+        if columns is not None:
+            columns = np.asarray(columns)
+        if columns is None or self.probability or self.weights.shape[1] == 1:
+            X = self._transform_ids(seqs)
+            if self.probability:
+                X = self._predict_proba(X)
+            else:
+                X = self._decision_function(X)
+            if columns is not None:
+                X = X[:, columns]
+        else:
+            X = self._transform_ids(seqs, columns=columns)
+        index, scores = self._top_k(X, k=k)
+        if columns is not None:
+            index = columns[index]
+        return index, scores
+
+    def active_columns(self, texts: list, k: int=1,
+                       min_count: int=1):
+        """Countries' indices that are among the top-k of,
+        at least, `min_count` texts; it is used to prune :py:func:`top_k`
+
+        :param texts: Sample of texts
+        """
+        index, _ = self.top_k(texts, k=k)
+        counts = np.bincount(index.ravel(), minlength=len(self.countries))
+        return np.flatnonzero(counts >= min_count)
+
+    @instrumented('predict')
+    def predict(self, texts: list):
+        """predict"""
+        X = self.transform(texts)
+        shape = (X.shape[0], len(self.countries))
+        if self.probability:
+            dtype = np.result_type(X, self.proba_coefs[0])
+            X = self._predict_proba(X, out=self._buffer('proba_out', shape, dtype))
+        else:
+            X = self._decision_function(X, out=self._buffer('df', shape, X.dtype))
+        return self.names[X.argmax(axis=1)]
+
+    @instrumented('predict_all')
+    def predict_all(self, texts: list,
+                    outputs: tuple=('predict', 'decision_function',
+                                    'positive'),
+                    margin: float=0):
+        """Compute several outputs transforming the texts only once.
+
+        :param texts: Texts
+        :param outputs: Subset of 'predict', 'decision_function', 'predict_proba', and 'positive'
+        :param margin: Margin used by 'positive'
+        :rtype: dict
+
+        The output is columnar, i.e., 'predict' is an array of labels,
+        'decision_function' and 'predict_proba' are matrices,
+        and 'positive' is a boolean matrix (texts x countries).
+        """
+        X = self.transform(texts)
+        return self._predict_all(X, outputs=outputs, margin=margin)
+
+    def _predict_all(self, X: np.ndarray,
+                     outputs: tuple=('predict', ),
+                     margin: float=0):
+        """Predict all helper function"""
+        valid = ('predict', 'decision_function', 'predict_proba', 'positive')
+        for key in outputs:
+            assert key in valid, f'{key} is not in {valid}'
+        output = {}
+        X_df = self._decision_function(X)
+        if 'decision_function' in outputs:
+            output['decision_function'] = X_df
+        if 'positive' in outputs:
+            output['positive'] = X_df > margin
+        if 'predict_proba' in outputs:
+            assert self.probability
+        X_pred = X_df
+        if 'predict_proba' in outputs:
+            X_pred = output['predict_proba'] = self._predict_proba(X)
+        elif self.probability and 'predict' in outputs:
+            shape = (X.shape[0], len(self.countries))
+            dtype = np.result_type(X, self.proba_coefs[0])
+            X_pred = self._predict_proba(X, out=self._buffer('proba_out', shape, dtype))
+        if 'predict' in outputs:
+            output['predict'] = self.names[X_pred.argmax(axis=1)]
+        return output
+
+    def predict_stream(self, texts: Iterable,
+                       batch_size: int=1024):
+        """Predict texts (str or dict) in batches of `batch_size`;
+        it yields one label per text."""
+        for batch in batches(texts, batch_size=batch_size):
+            yield from self.predict(batch)
+
+    def positive_stream(self, texts: Iterable,
+                        margin: float=0,
+                        k: int=None,
+                        batch_size: int=1024):
+        """Positive classes of texts (str or dict) in batches
+        of `batch_size`; it yields one dict per text."""
+        for batch in batches(texts, batch_size=batch_size):
+            yield from self.positive(batch, margin=margin, k=k)
+
+    def predict_file(self, filename: str, output: str,
+                     key: str='dialect',
+                     positive: bool=False,
+                     margin: float=0,
+                     k: int=None,
+                     batch_size: int=1024):
+        """Label a JSON-lines file (optionally gzipped); each line is
+        written, in the same order, to `output` (gzipped JSON-lines)
+        with the prediction stored in `key`.
+
+        :param filename: Input file, each line is a dict with the text
+        :param output: Output file
+        :param key: Key where the prediction is stored
+        :param positive: Store the positive classes instead of the label
+        """
+        with gzip.open(output, 'wt', encoding='utf-8') as fpt:
+            for batch in batches(tweet_iterator(filename),
+                                 batch_size=batch_size):
+                if positive:
+                    hy = [{label: float(v) for label, v in x.items()}
+                          for x in self.positive(batch, margin=margin, k=k)]
+                else:
+                    hy = self.predict(batch).tolist()
+                for tweet, value in zip(batch, hy):
+                    tweet[key] = value
+                    fpt.write(json.dumps(tweet) + '\n')
+
+    @property
+    def proba_coefs(self):
+        """Probability coefs"""
+        return self._proba_coefs
+
+    @proba_coefs.setter
+    def proba_coefs(self, value):
+        self._proba_coefs = value
+
+    @property
+    def countries(self):
+        """Countries"""
+        try:
+            return self.names
+        except AttributeError:
+            self.weights
+        return self.names
+
+
+class DialectIdLite(Predictor):
+    """DialectId restricted to inference; it is created
+    by :py:func:`load` and it does not import scikit-learn nor EncExp.
+
+    >>> from dialectid.lite import load
+    >>> detect = load('es.dialectid')  # doctest: +SKIP
+    >>> detect.predict(['comiendo unos tacos'])  # doctest: +SKIP
+    array(['mx'], dtype='<U2')
+    """
+
+    def __init__(self, lang: str=None, probability: bool=False,
+                 with_intercept: bool=True, merge_encode: bool=True,
+                 distance: bool=False, precision=np.float32, **kwargs):
+        self.lang = lang
+        self.probability = probability
+        self.with_intercept = with_intercept
+        self.merge_encode = merge_encode
+        self.distance = distance
+        self.precision = precision
+
+    @property
+    def norm(self):
+        """Weights norm"""
+        try:
+            return self._norm
+        except AttributeError:
+            from dialectid.quantize import column_norm
+            self._norm = column_norm(self.weights, self.scale,
+                                     dtype=self.precision)
+        return self._norm
+
+    @instrumented('transform')
+    def transform(self, texts: Iterable):
+        """Transform"""
+        return self._transform_texts(texts)
+
+
+def load(filename: str, mmap: bool=True, **kwargs):
+    """Load a binary model (see :py:func:`dialectid.binary.save`)
+    as a :py:class:`DialectIdLite`
+
+    :param filename: Binary model
+    :param mmap: Memory-map the arrays
+    :param kwargs: Parameters that replace the stored ones, e.g., `probability`
+    """
+    from dialectid.binary import read_arrays, decode_strings
+    header, arrays = read_arrays(filename, mmap=mmap)
+    params = header['params']
+    params.update(kwargs)
+    model = DialectIdLite(**params)
+    bow = header['bow']
+    bow_params = dict(bow.get('params', dict(lang=bow['lang'],
+                                             del_diac=bow['del_diac'],
+                                             token_max_filter=bow['token_max_filter'])))
+    n_buckets = bow_params.pop('n_buckets', None)
+    hash_seed = bow_params.pop('hash_seed', 0)
+    for key in ('n_components', 'n_nonzero'):
+        bow_params.pop(key, None)
+    seqTM = TextModel(**bow_params)
+    if n_buckets is None:
+        tokens = decode_strings(arrays['tokens'], arrays['tokens_offsets'])
+        seqTM.token2id = {k: v for v, k in enumerate(tokens)}
+    else:
+        from dialectid.hashing import HashedVocabulary
+        seqTM.token2id = HashedVocabulary(n_buckets, seed=hash_seed)
+    seqTM.weights = arrays['idf']
+    model.seqTM = seqTM
+    model.names = np.array(arrays['names'])
+    model.weights = arrays['weights']
+    if 'scale' in arrays:
+        model.scale = arrays['scale']
+    if 'intercept' in arrays:
+        model.intercept = arrays['intercept']
+    if 'proba_coef' in arrays:
+        model.proba_coefs = (arrays['proba_coef'],
+                             arrays['proba_intercept'])
+    return model
@@ -0,0 +1,175 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from typing import Callable
+from contextlib import nullcontext
+from functools import wraps
+from time import perf_counter
+import threading
+
+BATCH_BUCKETS = (1, 8, 32, 128, 512, 2048)
+
+
+class Metrics:
+    """Per-stage timers and counters of the hot path, e.g., transform,
+    predict, and positive, and of their internal steps, i.e., tokenize,
+    project, proba, and positive_dicts. The stages are inclusive, i.e.,
+    the time of predict contains the time of transform, and the latter
+    the time of tokenize and project. The instrumentation is off
+    unless the model has a :py:class:`Metrics` instance.
+
+    :param hooks: Callables invoked as hook(stage, seconds, size) after each stage
+    :param buckets: Upper bounds of the batch-size histogram
+
+    >>> from dialectid import DialectId
+    >>> from dialectid.metrics import Metrics
+    >>> dialectid = DialectId(lang='es')
+    >>> dialectid.metrics = Metrics()
+    >>> _ = dialectid.predict(['comiendo tacos'])  # doctest: +SKIP
+    >>> dialectid.metrics.to_dict()['stages']['predict']['texts']  # doctest: +SKIP
+    1
+    """
+
+    def __init__(self, hooks: list=None,
+                 buckets: tuple=BATCH_BUCKETS):
+        self.hooks = {}
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        for hook in ([] if hooks is None else hooks):
+            self.add_hook(hook)
+        self.clear()
+
+    def clear(self):
+        """Reset the timers and counters"""
+        with self.lock:
+            self.stages = {}
+            self.counters = {}
+
+    def add_hook(self, hook: Callable, stage: str=None):
+        """Register `hook`; it is invoked on `stage`, or on all stages when None"""
+        self.hooks.setdefault(stage, []).append(hook)
+
+    def count(self, name: str, value: int=1):
+        """Increase the counter `name`, e.g., tokens or cache hits"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage: str, seconds: float, size: int=None):
+        """Record a call of `stage` that took `seconds` and
+        processed `size` texts"""
+        with self.lock:
+            try:
+                _ = self.stages[stage]
+            except KeyError:
+                _ = dict(calls=0, texts=0, seconds=0.0, max_seconds=0.0,
+                         batch_sizes=[0] * (len(self.buckets) + 1))
+                self.stages[stage] = _
+            _['calls'] += 1
+            _['seconds'] += seconds
+            _['max_seconds'] = max(_['max_seconds'], seconds)
+            if size is not None:
+                _['texts'] += size
+                index = len(self.buckets)
+                for i, bound in enumerate(self.buckets):
+                    if size <= bound:
+                        index = i
+                        break
+                _['batch_sizes'][index] += 1
+        for hook in self.hooks.get(stage, []) + self.hooks.get(None, []):
+            hook(stage, seconds, size)
+
+    def to_dict(self):
+        """Timers and counters"""
+        with self.lock:
+            stages = {k: dict(v, batch_sizes=list(v['batch_sizes']))
+                      for k, v in self.stages.items()}
+            return dict(stages=stages, counters=dict(self.counters),
+                        buckets=list(self.buckets))
+
+    def prometheus(self, prefix: str='dialectid'):
+        """Timers and counters in the Prometheus text format"""
+        data = self.to_dict()
+        output = [f'# TYPE {prefix}_stage_seconds summary']
+        for stage, value in data['stages'].items():
+            output.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {value["seconds"]}')
+            output.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {value["calls"]}')
+        output.append(f'# TYPE {prefix}_stage_texts_total counter')
+        for stage, value in data['stages'].items():
+            output.append(f'{prefix}_stage_texts_total{{stage="{stage}"}} {value["texts"]}')
+        output.append(f'# TYPE {prefix}_batch_size histogram')
+        for stage, value in data['stages'].items():
+            total = 0
+            bounds = [str(x) for x in data['buckets']] + ['+Inf']
+            for bound, freq in zip(bounds, value['batch_sizes']):
+                total += freq
+                output.append(f'{prefix}_batch_size_bucket{{stage="{stage}",le="{bound}"}} {total}')
+            output.append(f'{prefix}_batch_size_sum{{stage="{stage}"}} {value["texts"]}')
+            output.append(f'{prefix}_batch_size_count{{stage="{stage}"}} {total}')
+        for name, value in data['counters'].items():
+            output.append(f'# TYPE {prefix}_{name}_total counter')
+            output.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(output) + '\n'
+
+
+def instrumented(stage: str):
+    """Decorator that records `stage` in the model's metrics;
+    the first argument of the method is the texts"""
+    def wrapper(func):
+        @wraps(func)
+        def inner(self, texts, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return func(self, texts, *args, **kwargs)
+            if not hasattr(texts, '__len__'):
+                texts = list(texts)
+            start = perf_counter()
+            output = func(self, texts, *args, **kwargs)
+            metrics.observe(stage, perf_counter() - start, len(texts))
+            return output
+        return inner
+    return wrapper
+
+
+class _Timer:
+    """Context manager that records `stage` in `metrics`"""
+
+    def __init__(self, metrics: Metrics, stage: str, size: int=None):
+        self.metrics = metrics
+        self.stage = stage
+        self.size = size
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.metrics.observe(self.stage, perf_counter() - self.start, self.size)
+        return False
+
+
+def timer(metrics: Metrics, stage: str, size: int=None):
+    """Context manager that records the time of `stage`
+    processing `size` texts; a no-op when `metrics` is None"""
+    if metrics is None:
+        return nullcontext()
+    return _Timer(metrics, stage, size)
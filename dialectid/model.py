@@ -23,33 +23,175 @@
 
 from typing import Iterable
 from dataclasses import dataclass
-from os.path import isfile, dirname, join
+from os.path import isfile, dirname, basename
+from tempfile import mkstemp
 import gzip
 import json
+import os
+import re
 import numpy as np
-from scipy.special import expit
-from sklearn.svm import LinearSVC
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import Normalizer
-from sklearn.model_selection import StratifiedKFold
-from sklearn.pipeline import make_pipeline
-from sklearn.utils.extmath import softmax
 from encexp import EncExpT, TextModel
-from encexp.download import download
-from dialectid.utils import BASEURL
-MODELS = join(dirname(__file__), 'models')
+from microtc.params import OPTION_GROUP, OPTION_NONE
+from microtc.utils import tweet_iterator, Counter
+from dialectid.utils import BASEURL, batches, reservoir, dataset_iterator
+from dialectid.quantize import quantize, dequantize, column_norm
+from dialectid.store import download
+# re-exported; dialectid.model.MODELS was the models' directory
+from dialectid.store import MODELS  # noqa: F401
+from dialectid.lite import Predictor
+from dialectid.metrics import instrumented
+from dialectid.hashing import HashedTFIDF
+
+
+def _fold(X, y: np.ndarray, tr: np.ndarray, vs: np.ndarray):
+    """Decision function of the validation set"""
+    from sklearn.svm import LinearSVC
+    m = LinearSVC(class_weight='balanced').fit(X[tr], y[tr])
+    hy = m.decision_function(X[vs])
+    if hy.ndim == 1:
+        hy = np.c_[hy]
+    return hy
+
+
+def _warm_start(X, y: np.ndarray, coef: np.ndarray, intercept: float,
+                fit_intercept: bool=True, eta0: float=0.01):
+    """Linear model (hinge loss) trained with SGD starting from
+    `coef` and `intercept`; y is 1 (country) or -1. The learning rate
+    is constant (`eta0`); the first steps of the optimal learning rate
+    are large enough to wipe out the initial weights."""
+    from sklearn.linear_model import SGDClassifier
+    m = SGDClassifier(loss='hinge', class_weight='balanced',
+                      fit_intercept=fit_intercept, random_state=0,
+                      learning_rate='constant', eta0=eta0)
+    m.fit(X, y, coef_init=coef, intercept_init=intercept)
+    return m.coef_[0], m.intercept_[0]
+
+
+class _Reiterable:
+    """Iterable that calls `func` to start each iteration, e.g.,
+    to stream a file more than once"""
+
+    def __init__(self, func):
+        self.func = func
+
+    def __iter__(self):
+        return iter(self.func())
+
+
+def next_version(filename: str):
+    """Filename of the next version of the model stored in `filename`,
+    i.e., `{filename}.v{n}.json.gz`"""
+    base = re.sub(r'\.v\d+$', '', filename.split('.json.gz')[0])
+    path = dirname(base) or '.'
+    pattern = re.compile(re.escape(basename(base)) + r'\.v(\d+)\.json\.gz$')
+    versions = [int(m.group(1)) for m in map(pattern.match, os.listdir(path))
+                if m is not None]
+    return f'{base}.v{max(versions, default=0) + 1}.json.gz'
+
+
+def _store(filename: str, data: Iterable):
+    """Atomic write of the JSON lines `data` into `filename` (gzip)"""
+    fd, tmp = mkstemp(dir=dirname(filename) or '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        with gzip.open(tmp, 'wb') as fpt:
+            for line in data:
+                fpt.write(bytes(json.dumps(line) + '\n',
+                                encoding='utf-8'))
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
 
 
 class BoW(TextModel):
+    """BoW; `n_buckets` replaces the vocabulary with the hashing
+    trick, optionally followed by a sparse random projection into
+    `n_components` dimensions (see :py:class:`dialectid.hashing.HashedTFIDF`)."""
+
+    def __init__(self, lang: str=None, text: str='text',
+                 num_option: str=OPTION_NONE, usr_option: str=OPTION_GROUP,
+                 url_option: str=OPTION_GROUP, emo_option: str=OPTION_NONE,
+                 hashtag_option: str=OPTION_NONE, ent_option: str=OPTION_NONE,
+                 lc: bool=True, del_dup: bool=False, del_punc: bool=False,
+                 del_diac: bool=True, select_ent: bool=False, select_suff: bool=False,
+                 select_conn: bool=False, max_dimension: bool=True,
+                 unit_vector: bool=True, q_grams_words: bool=True,
+                 norm_emojis: bool=True, token_list: list=None,
+                 token_min_filter: int=0,
+                 token_max_filter: int=int(2**17),
+                 weighting: str='microtc.weighting.TFIDF',
+                 norm_punc: bool=True, pretrained=True,
+                 n_buckets: int=None, n_components: int=None,
+                 n_nonzero: int=4, hash_seed: int=0):
+        self.n_buckets = n_buckets
+        self.n_components = n_components
+        self.n_nonzero = n_nonzero
+        self.hash_seed = hash_seed
+        super().__init__(lang=lang, text=text, num_option=num_option,
+                         usr_option=usr_option, url_option=url_option,
+                         emo_option=emo_option, hashtag_option=hashtag_option,
+                         ent_option=ent_option, lc=lc, del_dup=del_dup,
+                         del_punc=del_punc, del_diac=del_diac,
+                         select_ent=select_ent, select_suff=select_suff,
+                         select_conn=select_conn, max_dimension=max_dimension,
+                         unit_vector=unit_vector, q_grams_words=q_grams_words,
+                         norm_emojis=norm_emojis, token_list=token_list,
+                         token_min_filter=token_min_filter,
+                         token_max_filter=token_max_filter,
+                         weighting=weighting, norm_punc=norm_punc,
+                         pretrained=pretrained)
+
+    def identifier_filter(self, key, value):
+        """The vocabulary does not depend on the hashing parameters"""
+        if key in ('n_buckets', 'n_components', 'n_nonzero', 'hash_seed'):
+            return True
+        return super().identifier_filter(key, value)
+
+    def set_vocabulary(self, counter):
+        """Set vocabulary; the hashed vocabulary when `n_buckets` is given"""
+        if self.n_buckets is None:
+            return super().set_vocabulary(counter)
+        if not isinstance(counter, Counter):
+            counter = Counter(counter["dict"],
+                              counter["update_calls"])
+        tfidf = HashedTFIDF(self.n_buckets, n_components=self.n_components,
+                            n_nonzero=self.n_nonzero, seed=self.hash_seed)
+        self.model = tfidf.set_counter(counter)
+        self.weights = tfidf.wordWeight
+        self.pretrained = True
+
+    def fit(self, X, y=None):
+        """Estimate the tokens weights"""
+        if self.pretrained or self.n_buckets is None:
+            return super().fit(X, y)
+        counter = Counter()
+        for text in X:
+            counter.update(set(self.tokenize(text)))
+        self.set_vocabulary(counter)
+        return self
+
+    @property
+    def model_dir(self):
+        """Models' directory (see :py:func:`dialectid.store.model_dir`)"""
+        try:
+            return self._model_dir
+        except AttributeError:
+            return None
+
+    @model_dir.setter
+    def model_dir(self, value):
+        self._model_dir = value
+
     def download(self, first: bool=True):
         """download"""
         return download(self.identifier, first=first,
                         base_url=BASEURL,
-                        outputdir=MODELS)
+                        outputdir=self.model_dir)
 
 
 @dataclass
-class DialectId(EncExpT):
+class DialectId(Predictor, EncExpT):
     """DialectId"""
     token_max_filter: int=2**19
     del_diac: bool=True
@@ -57,10 +199,14 @@ class DialectId(EncExpT):
     probability: bool=False
     uniform_distribution: bool=True
     max_pos: int=2**19
+    quantize: str=None
+    model_dir: str=None
+    n_buckets: int=None
+    n_components: int=None
 
     def identifier_filter(self, key, value):
         """Test default parameters"""
-        if key == 'probability':
+        if key in ('probability', 'quantize', 'model_dir'):
             return True
         return super().identifier_filter(key, value)
 
@@ -70,9 +216,17 @@ class DialectId(EncExpT):
         try:
             return self._seqTM
         except AttributeError:
+            pretrained = self.model_dir is None
             _ = BoW(lang=self.lang,
                     del_diac=self.del_diac,
-                    token_max_filter=self.token_max_filter)
+                    token_max_filter=self.token_max_filter,
+                    pretrained=pretrained,
+                    n_buckets=self.n_buckets,
+                    n_components=self.n_components)
+            if not pretrained:
+                _.model_dir = self.model_dir
+                _.pretrained = True
+                _.set_vocabulary(_.download()['vocabulary'])
             self.seqTM = _
         return self._seqTM
 
@@ -80,85 +234,67 @@ class DialectId(EncExpT):
     def seqTM(self, value):
         self._seqTM = value
 
-    def _predict_proba(self, X: np.ndarray):
-        """Predict probability helper function"""
-        norm = Normalizer()
-        X = norm.transform(X)
-        coef, intercept = self.proba_coefs
-        res = X @ coef + intercept
-        if res.ndim == 1:
-            expit(res, out=res)
-            return np.c_[1 - res, res]
-        return softmax(res)
-
-    def predict_proba(self, texts: list):
-        """Predict proba"""
-        assert self.probability
-        X = self.transform(texts)
-        return self._predict_proba(X)
-    
-    def decision_function(self, texts: list):
-        """Decision function"""
-        X = self.transform(texts)
-        if X.shape[1] == 1:
-            X = np.c_[-X[:, 0], X[:, 0]]
-        return X
-    
-    def positive(self, texts: list,
-                 margin: float=0):
-        """Positive classes"""
-        X = self.transform(texts)
-        X_df = X
-        if X_df.shape[1] == 1:
-            X_df = np.c_[-X_df[:, 0], X_df[:, 0]]
-        if self.probability:
-            X = self._predict_proba(X)
-        else:
-            X = X_df
-        output = []
-        labels = self.countries
-        for mask, value in zip(X_df > margin, X):
-            _ = {str(k): v for k, v in zip(labels[mask], value[mask])}
-            output.append(_)
+    @property
+    def cache(self):
+        """Cache of :py:func:`DialectId.transform`
+        (see :py:class:`dialectid.cache.Cache`); None disables it."""
+        try:
+            return self._cache
+        except AttributeError:
+            return None
+
+    @cache.setter
+    def cache(self, value):
+        self._cache = value
+
+    @instrumented('transform')
+    def transform(self, texts: Iterable):
+        """Transform"""
+        cache = self.cache
+        if cache is None:
+            return self._transform_texts(texts)
+        metrics = self.metrics
+        if metrics is None:
+            return cache.transform(self._transform_texts, list(texts))
+        hits, misses = cache.hits, cache.misses
+        output = cache.transform(self._transform_texts, list(texts))
+        metrics.count('cache_hits', cache.hits - hits)
+        metrics.count('cache_misses', cache.misses - misses)
         return output
 
-    def predict(self, texts: list):
-        """predict"""
-        if self.probability:
-            X = self.predict_proba(texts)
-        else:
-            X = self.decision_function(texts)
-        return self.names[X.argmax(axis=1)]
+    @property
+    def norm(self):
+        """Weights norm"""
+        if self.quantize is None:
+            return super().norm
+        try:
+            return self._norm
+        except AttributeError:
+            self.norm = column_norm(self.weights, self.scale,
+                                    dtype=self.precision)
+        return self._norm
+
+    @norm.setter
+    def norm(self, value):
+        self._norm = value
 
     def download(self, first: bool=True):
         """download"""
         return download(self.identifier, first=first,
                         base_url=BASEURL,
-                        outputdir=MODELS)
-
-    @property
-    def proba_coefs(self):
-        """Probability coefs"""
-        return self._proba_coefs
-
-    @proba_coefs.setter
-    def proba_coefs(self, value):
-        self._proba_coefs = value
-
-    @property
-    def countries(self):
-        """Countries"""
-        try:
-            return self.names
-        except AttributeError:
-            self.weights
-        return self.names
+                        outputdir=self.model_dir)
 
     def set_weights(self, data: Iterable):
         # if not self.probability:
         #     return super().set_weights(data)
         data = list(data)
         super().set_weights([x for x in data if 'coef' in x])
+        if self.n_components is not None:
+            W = self.seqTM.model.fold(self.weights)
+            self.weights = np.asanyarray(W, dtype=self.precision)
+        if self.quantize is not None:
+            self.weights, self.scale = quantize(self.weights,
+                                                method=self.quantize)
         proba = [x for x in data if 'proba_coef' in x]
         if len(proba) == 0:
             return
@@ -172,11 +308,73 @@ class DialectId(EncExpT):
         self.proba_coefs = (np.asanyarray(coef, dtype=self.precision),
                             np.asanyarray(inter, dtype=self.precision))
 
+    def design_matrix(self, D: Iterable, chunk_size: int=2**14,
+                      normalized: bool=False):
+        """BoW representation (sparse matrix) of D built
+        incrementally, transforming `chunk_size` texts at a time;
+        `normalized` indicates that the texts are the output of the
+        text transformations (e.g., the TSV of :py:func:`tailored`)"""
+        from copy import copy
+        from scipy.sparse import vstack
+        seqTM = self.seqTM
+        if normalized:
+            seqTM = copy(seqTM)
+            seqTM.disable_text_transformations = True
+        return vstack([seqTM.transform(chunk)
+                       for chunk in batches(D, batch_size=chunk_size)],
+                      format='csr')
+
+    def cv_decision_function(self, X, y: np.ndarray,
+                             n_jobs: int=-1, n_splits: int=3,
+                             out: np.ndarray=None):
+        """Out-of-fold decision function of LinearSVC;
+        the folds are trained in parallel. `out` (e.g., a memmap)
+        stores the output."""
+        from sklearn.model_selection import StratifiedKFold
+        from joblib import Parallel, delayed
+        folds = list(StratifiedKFold(n_splits=n_splits).split(X, y))
+        output = Parallel(n_jobs=n_jobs)(delayed(_fold)(X, y, tr, vs)
+                                         for tr, vs in folds)
+        df = out
+        if df is None:
+            df = np.empty((X.shape[0], output[0].shape[1]))
+        for (_, vs), hy in zip(folds, output):
+            df[vs] = hy
+        return df
+
+    def calibrate(self, df: np.ndarray, y: np.ndarray):
+        """Fit the probability calibration (LogisticRegression) on
+        the out-of-fold decision function"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import Normalizer
+        from sklearn.pipeline import make_pipeline
+        model = make_pipeline(Normalizer(),
+                              LogisticRegression(class_weight='balanced')).fit(df, y)
+        lr = model[1]
+        self._lr = model
+        if lr.coef_.shape[0] == 1:
+            self.proba_coefs = (lr.coef_[0], lr.intercept_)
+        else:
+            self.proba_coefs = (lr.coef_.T, lr.intercept_)
+        return self
+
     def tailored(self, D: Iterable=None, filename: str=None,
                  tsv_filename: str=None, min_pos: int=32,
                  max_pos: int=int(2**21), n_jobs: int=-1,
                  self_supervised: bool=False, ds: object=None,
-                 train: object=None, Dprob: list=None):
+                 train: object=None, Dprob: list=None,
+                 Xprob=None, df_filename: str=None,
+                 max_per_class: int=None, chunk_size: int=2**14):
+        """Load/Create tailored model
+
+        :param D: Dataset (list of dict with text and klass) or JSON-lines filename (optionally gzipped); it is streamed into `tsv_filename`
+        :param Dprob: Dataset used on the probability calibration (list or filename, see :py:func:`dialectid.utils.dataset_iterator`); default D or, when D is an iterator, tsv_filename. The texts of a TSV are already normalized
+        :param Xprob: BoW representation of Dprob, i.e., `self.seqTM.transform(Dprob)`
+        :param df_filename: Out-of-fold decision function (.npy); it is stored after
+                            computing it, and used, if it exists, instead of training the folds
+        :param max_per_class: Maximum number of examples per class used on the calibration (reservoir sampling); when it is None, a filename (Dprob or the TSV) is streamed twice, once for the labels and once for the design matrix, and it is not loaded into memory
+        :param chunk_size: Number of texts transformed at a time
+        """
         kwargs = dict(filename=filename, tsv_filename=tsv_filename,
                       min_pos=min_pos, max_pos=max_pos, n_jobs=n_jobs,
                       self_supervised=self_supervised, ds=ds, train=train)
@@ -184,33 +382,182 @@ class DialectId(EncExpT):
             filename = filename.split('.json.gz')[0]
         else:
             filename = self.identifier
+        source = D
+        if isinstance(D, str):
+            D = tweet_iterator(D)
+        elif D is not None and not isinstance(D, list) and tsv_filename is None:
+            D = source = list(D)
         if isfile(f'{filename}.json.gz'):
+            kwargs.update(filename=f'{filename}.json.gz')
             return super().tailored(D=D, **kwargs)
         super().tailored(D=D, **kwargs)
-        _, nrows = self.weights.shape
-        if Dprob is None:
-            Dprob = D
-        X = self.seqTM.transform(Dprob)
-        df = np.empty((X.shape[0], nrows))        
+        tsv = None
+        if Dprob is None and isinstance(source, (str, list)):
+            Dprob = source
+        elif Dprob is None:
+            Dprob, tsv = tsv_filename, True
+        if isinstance(Dprob, str) and tsv is None:
+            tsv = Dprob.endswith('.tsv')
+        # the TSV contains the normalized texts
+        normalized = bool(tsv)
+        if max_per_class is not None:
+            assert Xprob is None
+            if isinstance(Dprob, str):
+                Dprob = dataset_iterator(Dprob, tsv=tsv)
+            Dprob = reservoir(Dprob, max_per_class)
+        elif isinstance(Dprob, str):
+            # two passes over the file: the labels and the design matrix
+            path = Dprob
+            Dprob = _Reiterable(lambda: dataset_iterator(path, tsv=tsv))
+        elif not isinstance(Dprob, list):
+            Dprob = list(Dprob)
         y = np.array([x['klass'] for x in Dprob])
-        for tr, vs in StratifiedKFold(n_splits=3).split(X, y):
-            m = LinearSVC(class_weight='balanced').fit(X[tr], y[tr])
-            _ = m.decision_function(X[vs])
-            if _.ndim == 1:
-                _ = np.c_[_]
-            df[vs] = _
-        model = make_pipeline(Normalizer(),
-                              LogisticRegression(class_weight='balanced')).fit(df, y)
-        lr = model[1]
-        self._lr = model
-        if lr.coef_.shape[0] == 1:
-            self.proba_coefs = (lr.coef_[0], lr.intercept_)
+        if df_filename is not None and isfile(df_filename):
+            df = np.load(df_filename, mmap_mode='r')
+            assert df.shape[0] == y.shape[0]
         else:
-            self.proba_coefs = (lr.coef_.T, lr.intercept_)
+            if Xprob is None:
+                Xprob = self.design_matrix(Dprob, chunk_size=chunk_size,
+                                           normalized=normalized)
+            if df_filename is None:
+                df = self.cv_decision_function(Xprob, y, n_jobs=n_jobs)
+            else:
+                nclasses = np.unique(y).shape[0]
+                shape = (y.shape[0], 1 if nclasses == 2 else nclasses)
+                tmp = f'{df_filename}.tmp'
+                df = np.lib.format.open_memmap(tmp, mode='w+',
+                                               dtype=np.float64, shape=shape)
+                self.cv_decision_function(Xprob, y, n_jobs=n_jobs, out=df)
+                df.flush()
+                # a mapped file cannot be renamed on Windows
+                del df
+                os.replace(tmp, df_filename)
+                df = np.load(df_filename, mmap_mode='r')
+        self.calibrate(df, y)
+        if isfile(f'{filename}.json.gz'):
+            data = list(tweet_iterator(f'{filename}.json.gz'))
+            _store(f'{filename}.json.gz', data + [self._proba_data()])
+        elif self.n_components is None:
+            # without filename, EncExpT keeps the weights only in memory
+            self.store(f'{filename}.json.gz')
+        return self
 
-        with gzip.open(f'{filename}.json.gz', 'ab') as fpt:
-            coef, intercept = self.proba_coefs
-            data = dict(proba_coef=coef.astype(np.float32).tobytes().hex(),
-                        proba_intercept=intercept.astype(np.float32).tobytes().hex())
-            fpt.write(bytes(json.dumps(data) + '\n',
-                      encoding='utf-8'))
+    def _proba_data(self):
+        """Probability coefficients (JSON)"""
+        coef, intercept = self.proba_coefs
+        return dict(proba_coef=coef.astype(np.float32).tobytes().hex(),
+                    proba_intercept=intercept.astype(np.float32).tobytes().hex())
+
+    def _country_weights(self):
+        """Weights and intercept of each country; the binary model,
+        i.e., one column, is expanded into two countries"""
+        W = dequantize(self.weights, self.scale, dtype=self.precision)
+        if self.with_intercept:
+            intercept = np.asanyarray(self.intercept, dtype=self.precision)
+        else:
+            intercept = np.zeros(W.shape[1], dtype=self.precision)
+        if W.shape[1] == 1:
+            neg, pos = self.names
+            return {neg: (-W[:, 0], -intercept[0]),
+                    pos: (W[:, 0], intercept[0])}
+        return {name: (W[:, i], intercept[i])
+                for i, name in enumerate(self.names)}
+
+    def store(self, filename: str):
+        """Store the model (EncExp format plus the probability
+        coefficients) into `filename`; the file is replaced atomically.
+        Quantized weights are upcasted to float16."""
+        assert self.n_components is None, 'The projection is folded into the weights'
+        W = self.weights
+        names = self.names.tolist()
+        labels = [names] if W.shape[1] == 1 else names
+        data = []
+        for i, label in enumerate(labels):
+            scale = None if self.scale is None else self.scale[i]
+            coef = dequantize(W[:, i], scale, dtype=np.float16)
+            _ = dict(coef=coef.tobytes().hex(), label=label)
+            if self.with_intercept:
+                intercept = np.asanyarray(self.intercept[i:i + 1], dtype=np.float16)
+                _['intercept'] = intercept.tobytes().hex()
+            data.append(_)
+        try:
+            data.append(self._proba_data())
+        except AttributeError:
+            pass
+        _store(filename, data)
+        return filename
+
+    def update(self, D: Iterable, filename: str=None,
+               refit: list=None, remove: list=None,
+               Dprob: list=None, n_jobs: int=-1,
+               eta0: float=0.01):
+        """Incremental update of the model. The linear models of the
+        countries in `refit` are warm-started from the current weights,
+        countries in `refit` without weights are added, the countries
+        in `remove` are deleted, and the probability calibration is fitted again.
+
+        :param D: Dataset (list of dict with text and klass)
+        :param filename: The model is stored in :py:func:`next_version` of `filename`
+        :param refit: Countries trained; default the countries in D. [] only fits the calibration
+        :param remove: Countries removed
+        :param Dprob: Held-out dataset used on the probability calibration. It must contain all the countries; when it is None, the calibration is fitted on the out-of-fold decision function of D (see :py:func:`cv_decision_function`)
+        :param eta0: Learning rate of the warm start
+
+        >>> from dialectid import DialectId
+        >>> detect = DialectId(lang='es', probability=True)  # doctest: +SKIP
+        >>> detect.update(D, filename='es.json.gz')  # doctest: +SKIP
+        >>> detect.artifact  # doctest: +SKIP
+        'es.v1.json.gz'
+        """
+        from joblib import Parallel, delayed
+        assert self.n_components is None, 'The projection is folded into the weights'
+        D = list(D)
+        y = np.array([x['klass'] for x in D])
+        remove = [] if remove is None else remove
+        countries = self._country_weights()
+        for name in remove:
+            del countries[name]
+        if refit is None:
+            refit = [str(x) for x in np.unique(y) if x not in remove]
+        names = sorted(set(countries).union(refit))
+        if len(names) == 2:
+            refit = names[1:] if len(refit) else []
+        if len(refit):
+            assert np.unique(y).shape[0] > 1, 'D must contain, at least, two countries'
+            X = self.seqTM.transform(D)
+            zeros = (np.zeros(X.shape[1], dtype=self.precision), 0)
+            output = Parallel(n_jobs=n_jobs)(delayed(_warm_start)(X, np.where(y == name, 1, -1),
+                                                                  *countries.get(name, zeros),
+                                                                  fit_intercept=self.with_intercept,
+                                                                  eta0=eta0)
+                                             for name in refit)
+            for name, (coef, intercept) in zip(refit, output):
+                countries[name] = (coef, intercept)
+        columns = names[1:] if len(names) == 2 else names
+        weights = np.column_stack([countries[name][0] for name in columns])
+        self.names = np.array(names)
+        self.weights = np.asanyarray(weights, dtype=self.precision)
+        self.scale = None
+        if self.quantize is not None:
+            self.weights, self.scale = quantize(self.weights,
+                                                method=self.quantize)
+        if self.with_intercept:
+            self.intercept = np.array([countries[name][1] for name in columns],
+                                      dtype=self.precision)
+        self.__dict__.pop('_norm', None)
+        if self.cache is not None:
+            self.cache.clear()
+        if Dprob is None:
+            assert set(y) == set(names), 'D must contain all the countries'
+            if not len(refit):
+                X = self.seqTM.transform(D)
+            df = self.cv_decision_function(X, y, n_jobs=n_jobs)
+            self.calibrate(df, y)
+        else:
+            yprob = np.array([x['klass'] for x in Dprob])
+            assert set(yprob) == set(names), 'Dprob must contain all the countries'
+            df = self.transform([x['text'] for x in Dprob])
+            self.calibrate(df, yprob)
+        if filename is not None:
+            self.artifact = self.store(next_version(filename))
+        return self
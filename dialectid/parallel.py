@@ -0,0 +1,200 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+from tempfile import mkstemp
+from time import perf_counter
+import os
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.utils import batches
+
+# Models available to the workers; with fork, the children inherit
+# this dictionary (copy-on-write); otherwise, it is populated by
+# the initializer using memory-mapped binary models.
+_MODELS = {}
+
+
+def _initializer(key: int, filename: str):
+    """Worker initializer"""
+    from dialectid.binary import load
+    if key not in _MODELS:
+        _MODELS[key] = load(filename)
+
+
+def _run(key: int, method: str, texts: list, kwargs: dict):
+    """Call `method` of the worker's model"""
+    return getattr(_MODELS[key], method)(texts, **kwargs)
+
+
+class ParallelDialectId:
+    """Run a :py:class:`DialectId` on several processes;
+    the model is loaded once in the parent, and the workers share it
+    (fork's copy-on-write or a memory-mapped binary model).
+
+    :param model: DialectId with its weights loaded
+    :param n_jobs: Number of workers, -1 uses all the cores
+    :param start_method: fork, spawn, or forkserver; default is the platform's
+    :param filename: Binary model (see :py:func:`dialectid.binary.save`) used
+                     when the start method is not fork; a temporary file
+                     is created when it is None.
+
+    >>> from dialectid import DialectId
+    >>> from dialectid.parallel import ParallelDialectId
+    >>> with ParallelDialectId(DialectId(lang='es'), n_jobs=2) as pool:
+    ...     pool.predict(['comiendo unos tacos', 'pibe'])  # doctest: +SKIP
+    array(['mx', 'ar'], dtype='<U2')
+    """
+
+    def __init__(self, model: DialectId, n_jobs: int=-1,
+                 start_method: str=None, filename: str=None):
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+        self.model = model
+        self.n_jobs = n_jobs
+        if start_method is None:
+            start_method = mp.get_start_method()
+        self.start_method = start_method
+        self._tmp = None
+        # loaded before forking, so the workers share them
+        model.weights
+        model.seqTM
+        model.tokenizer
+        key = id(model)
+        if start_method == 'fork':
+            _MODELS[key] = model
+        elif filename is None:
+            from dialectid.binary import save
+            fd, filename = mkstemp(suffix='.dialectid')
+            os.close(fd)
+            save(model, filename)
+            self._tmp = filename
+        self.key = key
+        self.filename = filename
+        self.executor = ProcessPoolExecutor(max_workers=n_jobs,
+                                            mp_context=mp.get_context(start_method),
+                                            initializer=_initializer,
+                                            initargs=(key, filename))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Shutdown the workers"""
+        self.executor.shutdown()
+        _MODELS.pop(self.key, None)
+        if self._tmp is not None:
+            os.unlink(self._tmp)
+            self._tmp = None
+
+    def map(self, method: str, texts: list,
+            chunk_size: int=None, **kwargs):
+        """Shard `texts` among the workers, call `method`, and
+        merge the results keeping the original order"""
+        texts = list(texts)
+        if len(texts) == 0:
+            return getattr(self.model, method)(texts, **kwargs)
+        if chunk_size is None:
+            chunk_size = int(np.ceil(len(texts) / self.n_jobs))
+        chunks = list(batches(texts, batch_size=chunk_size))
+        output = list(self.executor.map(_run,
+                                        [self.key] * len(chunks),
+                                        [method] * len(chunks),
+                                        chunks,
+                                        [kwargs] * len(chunks)))
+        if isinstance(output[0], np.ndarray):
+            return np.concatenate(output, axis=0)
+        return [x for chunk in output for x in chunk]
+
+    def transform(self, texts: list, **kwargs):
+        """Transform"""
+        return self.map('transform', texts, **kwargs)
+
+    def decision_function(self, texts: list, **kwargs):
+        """Decision function"""
+        return self.map('decision_function', texts, **kwargs)
+
+    def predict_proba(self, texts: list, **kwargs):
+        """Predict proba"""
+        return self.map('predict_proba', texts, **kwargs)
+
+    def predict(self, texts: list, **kwargs):
+        """Predict"""
+        return self.map('predict', texts, **kwargs)
+
+    def positive(self, texts: list, **kwargs):
+        """Positive classes"""
+        return self.map('positive', texts, **kwargs)
+
+
+def scaling(model: DialectId, texts: list,
+            n_jobs: list=[1, 2, 4],
+            method: str='predict',
+            start_method: str=None):
+    """Throughput (texts per second) of `method` for
+    different numbers of workers; n_jobs=0 is the model without
+    a pool."""
+    output = []
+    for n in n_jobs:
+        if n == 0:
+            start = perf_counter()
+            getattr(model, method)(texts)
+            elapsed = perf_counter() - start
+        else:
+            with ParallelDialectId(model, n_jobs=n,
+                                   start_method=start_method) as pool:
+                # warm up the workers
+                pool.map(method, texts[:n])
+                start = perf_counter()
+                pool.map(method, texts)
+                elapsed = perf_counter() - start
+        output.append(dict(n_jobs=n, seconds=elapsed,
+                           throughput=len(texts) / elapsed))
+    return output
+
+
+def main(args=None):
+    """Scaling benchmark: throughput vs. number of workers"""
+    import argparse
+    import json
+    from microtc.utils import tweet_iterator
+    parser = argparse.ArgumentParser(description='DialectId throughput vs. number of workers')
+    parser.add_argument('filename', help='JSON-lines file with the texts')
+    parser.add_argument('-l', '--lang', default='es', help='language')
+    parser.add_argument('-n', '--n-jobs', type=int, nargs='+',
+                        default=[0, 1, 2, 4], dest='n_jobs')
+    parser.add_argument('--start-method', default=None, dest='start_method')
+    args = parser.parse_args(args)
+    texts = list(tweet_iterator(args.filename))
+    model = DialectId(lang=args.lang, use_tqdm=False)
+    for row in scaling(model, texts, n_jobs=args.n_jobs,
+                       start_method=args.start_method):
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from functools import lru_cache
+from unicodedata import normalize as unicode_normalize
+import re
+from microtc import emoticons
+from microtc.params import OPTION_DELETE, OPTION_GROUP
+from microtc.textmodel import SKIP_SYMBOLS, expand_qgrams_word_list
+
+SEP = '\x1e'
+WHITESPACES = ('\n', '\r', ' ', '\t', '\xa0')
+COMBINING = range(0x300, 0x370)
+
+
+@lru_cache(maxsize=None)
+def norm_tokens(norm_emojis: bool=True, norm_punc: bool=True):
+    """Tokens replaced after the normalization (see EncExp's TextModel),
+    their trie, and a regular expression matching the trie's first
+    characters (ranges of the BMP and any character outside it);
+    they are built once per process."""
+    _ = ['_htag', '_ent', '_num', '_url', '_usr']
+    tokens = {k: f'~e:{k}~' for k in _}
+    if norm_emojis:
+        _ = {k: f'~e:{v.replace("~", "")}~'
+             for k, v in emoticons.read_emojis().items()}
+        tokens.update(_)
+    if norm_punc:
+        _ = {k: f'~e:{k}~' for k in SKIP_SYMBOLS if k != '~'}
+        tokens.update(_)
+    head = emoticons.create_data_structure({x: True for x in tokens})
+    ranges = []
+    for char in sorted(ord(x) for x in head if ord(x) <= 0xFFFF):
+        if len(ranges) and ranges[-1][1] == char - 1:
+            ranges[-1][1] = char
+        else:
+            ranges.append([char, char])
+    ranges = ''.join(f'{re.escape(chr(a))}-{re.escape(chr(b))}'
+                     for a, b in ranges)
+    start = re.compile(f'[{ranges}\U00010000-\U0010FFFF]')
+    return tokens, head, start
+
+
+@lru_cache(maxsize=None)
+def translation_table(del_diac: bool=True, del_punc: bool=False):
+    """Table of :py:func:`str.translate` equivalent to
+    :py:func:`microtc.textmodel.norm_chars` (applied after NFD)
+    without removing duplicates"""
+    table = {ord(x): '~' for x in WHITESPACES}
+    if del_diac:
+        table.update({x: None for x in COMBINING})
+    if del_punc:
+        table.update({ord(x): None for x in SKIP_SYMBOLS})
+    return table
+
+
+class Tokenizer:
+    """Batch tokenizer equivalent to the `tokenize` of
+    :py:class:`dialectid.model.BoW` and :py:class:`dialectid.lite.TextModel`.
+    The texts of a batch are joined and normalized with a few calls
+    (regular expressions and a translation table), the tokens are replaced
+    by scanning only from the characters that start a token, and
+    the q-grams are computed with list comprehensions.
+    The text model is used when some of its parameters are not supported.
+
+    :param text_model: Text model
+
+    >>> from dialectid.lite import TextModel
+    >>> from dialectid.preprocess import Tokenizer
+    >>> tokenizer = Tokenizer(TextModel(lang='es'))
+    >>> tokenizer.tokenize_batch(['buenos días'])[0][:3]
+    ['buenos~dias', 'buenos', 'dias']
+    """
+
+    def __init__(self, text_model):
+        self.text_model = text_model
+        tm = text_model
+        self.supported = (tm.emo_map is None and not tm.select_ent and
+                          not tm.del_dup and not tm.select_suff and
+                          not tm.select_conn and len(tm.skip_grams) == 0 and
+                          tm.q_grams_words and
+                          not tm.disable_text_transformations and
+                          getattr(tm, 'norm_emojis', False) and
+                          hasattr(tm, 'norm_punc'))
+        if not self.supported:
+            return
+        self.tokens, self.head, self.start = norm_tokens(tm.norm_emojis,
+                                                         tm.norm_punc)
+        self.table = translation_table(tm.del_diac, tm.del_punc)
+        self.n_grams = [abs(x) for x in tm.n_grams]
+        self.q_grams = list(tm.q_grams)
+
+    def _get_text(self, text):
+        """Text of a str, dict, or None"""
+        if text is None:
+            return ''
+        if isinstance(text, dict):
+            return self.text_model.get_text(text)
+        return text
+
+    def normalize(self, text: str):
+        """Normalized text before the tokens' replacement"""
+        tm = self.text_model
+        if tm.hashtag_option == OPTION_DELETE:
+            text = re.sub(r"#\S+", "", text)
+        elif tm.hashtag_option == OPTION_GROUP:
+            text = re.sub(r"#\S+", "_htag", text)
+        if tm.ent_option == OPTION_DELETE:
+            text = re.sub(r"[A-Z][a-z]+", "", text)
+        elif tm.ent_option == OPTION_GROUP:
+            text = re.sub(r"[A-Z][a-z]+", "_ent", text)
+        if tm.lc:
+            text = text.lower()
+        if tm.num_option == OPTION_DELETE:
+            text = re.sub(r"\d\d*\.?\d*|\d*\.\d\d*", "", text)
+        elif tm.num_option == OPTION_GROUP:
+            text = re.sub(r"\d\d*\.?\d*|\d*\.\d\d*", "_num", text)
+        if tm.url_option == OPTION_DELETE:
+            text = re.sub(r"https?://\S+", "", text)
+        elif tm.url_option == OPTION_GROUP:
+            text = re.sub(r"https?://\S+", "_url", text)
+        if tm.usr_option == OPTION_DELETE:
+            text = re.sub(r"@\S+", "", text)
+        elif tm.usr_option == OPTION_GROUP:
+            text = re.sub(r"@\S+", "_usr", text)
+        return unicode_normalize('NFD', text).translate(self.table)
+
+    def replace(self, text: str):
+        """Replace the tokens (emojis, punctuation, and groups);
+        it follows :py:func:`microtc.emoticons.find_token`, i.e., the
+        longest token starting at a position or, otherwise, it skips
+        the longest prefix of a token."""
+        tokens = self.tokens
+        head = self.head
+        search = self.start.search
+        size = len(text)
+        output = []
+        prev = pos = 0
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            init = i = end = match.start()
+            current = head
+            while i < size:
+                current = current.get(text[i])
+                if current is None:
+                    break
+                i += 1
+                if '__end__' in current:
+                    end = i
+            if end > init:
+                output.append(text[prev:init])
+                output.append(tokens[text[init:end]])
+                prev = pos = end
+            else:
+                pos = max(i, init + 1)
+        output.append(text[prev:])
+        text = re.sub('~+', '~', ''.join(output))
+        if not self.text_model.del_diac:
+            text = unicode_normalize('NFD', text)
+        return text
+
+    def text_transformations_batch(self, texts: list):
+        """Text transformations of a batch"""
+        texts = [self._get_text(x) for x in texts]
+        if not self.supported:
+            return [self.text_model.text_transformations(x) for x in texts]
+        if any(SEP in x for x in texts):
+            return [self.replace('~' + self.normalize(x) + '~') for x in texts]
+        text = self.normalize(SEP.join(texts))
+        text = '~' + text.replace(SEP, f'~{SEP}~') + '~'
+        return self.replace(text).split(SEP)
+
+    def compute_tokens(self, text: str):
+        """Tokens of a normalized text"""
+        words = text.split('~')[1:-1]
+        output = []
+        for q in self.n_grams:
+            if q == 1:
+                output.extend(words)
+            else:
+                expand_qgrams_word_list(words, q, output)
+        words = ['~' + x + '~' for x in words if x[:2] != 'e:']
+        for q in self.q_grams:
+            output.extend(['q:' + word[i:i + q]
+                           for word in words
+                           for i in range(len(word) - q + 1)])
+        if len(output) == 0:
+            return ['~']
+        return output
+
+    def tokenize_batch(self, texts: list):
+        """Tokens of each text"""
+        if not self.supported:
+            return [self.text_model.tokenize(x) for x in texts]
+        return [self.compute_tokens(x)
+                for x in self.text_transformations_batch(texts)]
+
+    def tokenize(self, text):
+        """Tokens of a text"""
+        return self.tokenize_batch([text])[0]
@@ -0,0 +1,118 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+import numpy as np
+
+QUANTIZE = (None, 'float16', 'int8')
+
+
+def quantize(weights: np.ndarray, method: str='int8'):
+    """Reduce the precision of the weights; it returns
+    the weights and the per-column scale (None for float16).
+
+    :param weights: Matrix (tokens x countries)
+    :param method: float16 or int8
+
+    >>> import numpy as np
+    >>> from dialectid.quantize import quantize, dequantize
+    >>> W = np.array([[0.5, -2], [-1, 1]])
+    >>> Q, scale = quantize(W)
+    >>> Q
+    array([[  64, -127],
+           [-127,   64]], dtype=int8)
+    >>> dequantize(Q, scale)
+    array([[ 0.503937, -2.      ],
+           [-1.      ,  1.007874]], dtype=float32)
+    """
+    assert method in QUANTIZE[1:], f'{method} is not in {QUANTIZE[1:]}'
+    if method == 'float16':
+        return np.asanyarray(weights, dtype=np.float16), None
+    scale = np.zeros(weights.shape[1], dtype=np.float32)
+    output = np.empty(weights.shape, dtype=np.int8)
+    for start, end in _blocks(weights.shape[0]):
+        _ = np.fabs(weights[start:end]).max(axis=0)
+        np.maximum(scale, _, out=scale)
+    scale /= 127
+    scale[scale == 0] = 1
+    for start, end in _blocks(weights.shape[0]):
+        _ = np.round(weights[start:end] / scale)
+        output[start:end] = np.clip(_, -127, 127)
+    return output, scale
+
+
+def dequantize(weights: np.ndarray, scale: np.ndarray=None,
+               dtype=np.float32):
+    """Upcast (a block of) the weights to `dtype`"""
+    output = np.asanyarray(weights, dtype=dtype)
+    if scale is not None:
+        output *= scale
+    return output
+
+
+def _blocks(size: int, block_size: int=2**14):
+    """Ranges covering `size` rows"""
+    for start in range(0, size, block_size):
+        yield start, min(start + block_size, size)
+
+
+def column_norm(weights: np.ndarray, scale: np.ndarray=None,
+                dtype=np.float32):
+    """Norm of the columns, upcasting the weights in blocks"""
+    output = np.zeros(weights.shape[1], dtype=dtype)
+    for start, end in _blocks(weights.shape[0]):
+        _ = dequantize(weights[start:end], scale, dtype=dtype)
+        output += (_ ** 2).sum(axis=0)
+    return np.sqrt(output)
+
+
+def evaluate(texts: list, y: list=None,
+             method: str='int8', **kwargs):
+    """Compare a quantized model against the full precision one
+    on `texts` (e.g., a held-out set).
+
+    :param texts: Texts
+    :param y: Labels; when given, the accuracy of both models is reported
+    :param method: float16 or int8
+    :param kwargs: DialectId parameters, e.g., `lang`
+    :rtype: dict
+    """
+    from dialectid.model import DialectId
+    full = DialectId(quantize=None, **kwargs)
+    reduced = DialectId(quantize=method, **kwargs)
+    output = {}
+    outputs = ('predict', 'decision_function')
+    full_output = full.predict_all(texts, outputs=outputs)
+    reduced_output = reduced.predict_all(texts, outputs=outputs)
+    diff = full_output['decision_function'] - reduced_output['decision_function']
+    output['max_abs_diff'] = float(np.fabs(diff).max())
+    hy_full = full_output['predict']
+    hy_reduced = reduced_output['predict']
+    output['agreement'] = float((hy_full == hy_reduced).mean())
+    if y is not None:
+        y = np.asarray(y)
+        output['accuracy'] = float((hy_full == y).mean())
+        output[f'accuracy_{method}'] = float((hy_reduced == y).mean())
+        output['accuracy_delta'] = output[f'accuracy_{method}'] - output['accuracy']
+    output['nbytes'] = int(full.weights.nbytes)
+    output[f'nbytes_{method}'] = int(reduced.weights.nbytes)
+    return output
@@ -0,0 +1,137 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from typing import Iterable, Callable
+from collections import OrderedDict, defaultdict
+import sys
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.utils import COUNTRIES
+
+
+def model_memory(model: DialectId):
+    """Approximate memory (bytes) used by a model: the arrays plus
+    the vocabulary's dictionary; memory-mapped arrays are included."""
+    arrays = [model.weights, model.seqTM.weights]
+    for attr in ['intercept', 'proba_coefs']:
+        try:
+            value = getattr(model, attr)
+        except AttributeError:
+            continue
+        if isinstance(value, tuple):
+            arrays.extend(value)
+        else:
+            arrays.append(value)
+    total = sum(np.asarray(x).nbytes for x in arrays)
+    token2id = model.seqTM.token2id
+    total += sys.getsizeof(token2id)
+    total += sum(sys.getsizeof(k) for k in token2id)
+    return total
+
+
+class Router:
+    """Serve several languages from one process; the texts are grouped
+    by language, and each group is predicted in one batch. The models
+    are loaded lazily, keeping at most `max_models` in memory
+    (least recently used eviction).
+
+    :param max_models: Maximum number of resident models
+    :param loader: Function that receives the language and returns the model;
+                   default is :py:class:`DialectId` with `kwargs`
+    :param kwargs: DialectId parameters
+
+    >>> from dialectid.router import Router
+    >>> router = Router(max_models=2)
+    >>> router.predict([('comiendo unos tacos', 'es'),
+    ...                 ('the subway is late', 'en')])  # doctest: +SKIP
+    ['mx', 'us']
+    """
+
+    def __init__(self, max_models: int=len(COUNTRIES),
+                 loader: Callable=None, **kwargs):
+        assert max_models > 0
+        self.max_models = max_models
+        self.loader = loader
+        self.kwargs = kwargs
+        self.models = OrderedDict()
+        self.loads = defaultdict(int)
+
+    def load(self, lang: str):
+        """Model of `lang`; it becomes the most recently used"""
+        assert lang in COUNTRIES, f'{lang} is not supported'
+        try:
+            self.models.move_to_end(lang)
+            return self.models[lang]
+        except KeyError:
+            pass
+        if self.loader is None:
+            model = DialectId(lang=lang, **self.kwargs)
+        else:
+            model = self.loader(lang)
+        model.weights
+        self.loads[lang] += 1
+        self.models[lang] = model
+        while len(self.models) > self.max_models:
+            self.models.popitem(last=False)
+        return model
+
+    def __getitem__(self, lang: str):
+        return self.load(lang)
+
+    def memory(self):
+        """Memory (bytes) per resident language"""
+        return {lang: model_memory(model)
+                for lang, model in self.models.items()}
+
+    def map(self, method: str, pairs: Iterable, **kwargs):
+        """Call `method` once per language; the output follows
+        the order of `pairs`, i.e., (text, lang)"""
+        groups = defaultdict(list)
+        size = 0
+        for index, (text, lang) in enumerate(pairs):
+            groups[lang].append((index, text))
+            size += 1
+        output = [None] * size
+        for lang, members in groups.items():
+            index = [i for i, _ in members]
+            texts = [text for _, text in members]
+            hy = getattr(self.load(lang), method)(texts, **kwargs)
+            for i, value in zip(index, hy):
+                output[i] = value
+        return output
+
+    def predict(self, pairs: Iterable):
+        """Predict"""
+        return [str(x) for x in self.map('predict', pairs)]
+
+    def decision_function(self, pairs: Iterable):
+        """Decision function"""
+        return self.map('decision_function', pairs)
+
+    def predict_proba(self, pairs: Iterable):
+        """Predict proba"""
+        return self.map('predict_proba', pairs)
+
+    def positive(self, pairs: Iterable, **kwargs):
+        """Positive classes"""
+        return self.map('positive', pairs, **kwargs)
@@ -0,0 +1,378 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+import asyncio
+import json
+import numpy as np
+from dialectid.model import DialectId
+
+METHODS = ('predict', 'predict_proba', 'positive')
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def _tojson(value):
+    """Output of a DialectId's method into JSON-compatible values"""
+    if isinstance(value, dict):
+        return {str(k): float(v) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _validate_kwargs(kwargs: dict):
+    """Error message of invalid margin or k; None when they are valid"""
+    margin = kwargs.get('margin', 0)
+    if isinstance(margin, bool) or not isinstance(margin, (int, float)):
+        return 'margin must be a number'
+    k = kwargs.get('k')
+    if k is not None and (isinstance(k, bool) or not isinstance(k, int) or k < 1):
+        return 'k must be a positive integer'
+    return None
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches of, at most,
+    `max_batch_size` texts, waiting at most `max_wait_ms` for
+    a batch to be filled.
+
+    :param model: DialectId
+    :param max_batch_size: Maximum number of texts per batch
+    :param max_wait_ms: Maximum time (milliseconds) to wait for more texts
+    :param executor: thread or process (see :py:class:`dialectid.parallel.ParallelDialectId`)
+    :param n_jobs: Number of processes when executor is process
+    """
+
+    def __init__(self, model: DialectId,
+                 max_batch_size: int=64,
+                 max_wait_ms: float=5,
+                 executor: str='thread',
+                 n_jobs: int=-1):
+        assert executor in ('thread', 'process')
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.pool = None
+        if executor == 'process':
+            from dialectid.parallel import ParallelDialectId
+            self.pool = ParallelDialectId(model, n_jobs=n_jobs)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.texts = 0
+
+    @property
+    def queue(self):
+        """Requests queue; it is created in the running loop"""
+        try:
+            return self._queue
+        except AttributeError:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def close(self):
+        """Release the executors"""
+        self.executor.shutdown()
+        if self.pool is not None:
+            self.pool.close()
+
+    def _call(self, method: str, texts: list, kwargs: dict):
+        """Run the model (executor's thread)"""
+        if self.pool is not None:
+            return self.pool.map(method, texts, **kwargs)
+        return getattr(self.model, method)(texts, **kwargs)
+
+    async def submit(self, method: str, text, **kwargs):
+        """Prediction of `text`; it waits for its batch"""
+        assert method in METHODS
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((method, text, kwargs, future))
+        return await future
+
+    async def _collect(self):
+        """Next batch"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(),
+                                                    timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        """Process the batches; it runs until it is cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batches += 1
+            self.texts += len(batch)
+            groups = {}
+            for method, text, kwargs, future in batch:
+                key = (method, json.dumps(kwargs, sort_keys=True))
+                groups.setdefault(key, []).append((text, future))
+            for (method, kwargs), members in groups.items():
+                texts = [text for text, _ in members]
+                kwargs = json.loads(kwargs)
+                try:
+                    hy = await loop.run_in_executor(self.executor, self._call,
+                                                    method, texts, kwargs)
+                except Exception:
+                    # one text at a time, so an error stays with its request
+                    await self._one_by_one(method, members, kwargs)
+                    continue
+                for (_, future), value in zip(members, hy):
+                    if not future.done():
+                        future.set_result(_tojson(value))
+
+    async def _one_by_one(self, method: str, members: list, kwargs: dict):
+        """Process each text of a failed batch on its own"""
+        loop = asyncio.get_running_loop()
+        for text, future in members:
+            try:
+                hy = await loop.run_in_executor(self.executor, self._call,
+                                                method, [text], kwargs)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+                continue
+            if not future.done():
+                future.set_result(_tojson(hy[0]))
+
+
+class Server:
+    """HTTP/1.1 server (asyncio) with the endpoints
+    POST /predict, /predict_proba, and /positive, whose body is
+    {"text": str} or {"texts": [str]} (and margin or k for /positive),
+    GET /health, and GET /metrics (Prometheus text format) when the
+    model has :py:class:`dialectid.metrics.Metrics`.
+
+    >>> from dialectid import DialectId
+    >>> from dialectid.serve import Server
+    >>> server = Server(DialectId(lang='es'), port=8080)
+    >>> server.run()  # doctest: +SKIP
+    """
+
+    def __init__(self, model: DialectId,
+                 host: str='127.0.0.1', port: int=8080,
+                 **kwargs):
+        self.model = model
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(model, **kwargs)
+
+    async def dispatch(self, verb: str, path: str, body: bytes):
+        """Status and payload of a request"""
+        path = path.strip('/')
+        if path == 'health':
+            return 200, dict(status='ok', batches=self.batcher.batches,
+                             texts=self.batcher.texts)
+        if path == 'metrics' and self.model.metrics is not None:
+            return 200, self.model.metrics.prometheus()
+        if path not in METHODS:
+            return 404, dict(error=f'/{path} not found')
+        if verb != 'POST':
+            return 405, dict(error='use POST')
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return 400, dict(error='invalid JSON')
+        if not isinstance(data, dict):
+            return 400, dict(error='the body must be a JSON object')
+        kwargs = {k: data[k] for k in ('margin', 'k')
+                  if path == 'positive' and k in data}
+        error = _validate_kwargs(kwargs)
+        if error is not None:
+            return 400, dict(error=error)
+        if path == 'predict_proba' and not self.model.probability:
+            return 400, dict(error='the model does not have probability')
+        if 'texts' in data:
+            texts = data['texts']
+            if not isinstance(texts, list) or\
+               not all(isinstance(text, str) for text in texts):
+                return 400, dict(error='texts must be a list of strings')
+        elif 'text' in data:
+            texts = [data['text']]
+            if not isinstance(texts[0], str):
+                return 400, dict(error='text must be a string')
+        else:
+            return 400, dict(error='text or texts is missing')
+        submit = self.batcher.submit
+        hy = await asyncio.gather(*[submit(path, text, **kwargs)
+                                    for text in texts])
+        if 'texts' in data:
+            return 200, {path: hy}
+        return 200, {path: hy[0]}
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter):
+        """Connection handler; it supports keep-alive"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb, path, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, value = line.decode('latin-1').split(':', 1)
+                    headers[key.strip().lower()] = value.strip()
+                size = int(headers.get('content-length', 0))
+                body = await reader.readexactly(size) if size else b''
+                try:
+                    status, payload = await self.dispatch(verb, path, body)
+                except Exception as error:
+                    status, payload = 500, dict(error=str(error))
+                content_type = 'application/json'
+                if isinstance(payload, str):
+                    content = bytes(payload, encoding='utf-8')
+                    content_type = 'text/plain; version=0.0.4'
+                else:
+                    content = bytes(json.dumps(payload), encoding='utf-8')
+                close = (headers.get('connection', '').lower() == 'close' or
+                         version == 'HTTP/1.0')
+                head = [f'HTTP/1.1 {status} {REASONS[status]}',
+                        f'Content-Type: {content_type}',
+                        f'Content-Length: {len(content)}',
+                        f'Connection: {"close" if close else "keep-alive"}']
+                writer.write(bytes('\r\n'.join(head) + '\r\n\r\n',
+                                   encoding='latin-1') + content)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Start the server and the batcher; it returns the asyncio's server"""
+        self._batcher = asyncio.create_task(self.batcher.run())
+        self.server = await asyncio.start_server(self.handle, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def stop(self):
+        """Stop the server and the batcher"""
+        self.server.close()
+        await self.server.wait_closed()
+        self._batcher.cancel()
+        self.batcher.close()
+
+    def run(self):
+        """Serve until interrupted"""
+        async def inner():
+            server = await self.start()
+            try:
+                async with server:
+                    await server.serve_forever()
+            finally:
+                await self.stop()
+        try:
+            asyncio.run(inner())
+        except KeyboardInterrupt:
+            pass
+
+
+def load_test(url: str='http://127.0.0.1:8080',
+              texts: list=['comiendo unos tacos'],
+              endpoint: str='predict',
+              requests: int=1000, concurrency: int=32):
+    """Send `requests` single-text requests with `concurrency`
+    clients; it returns the throughput and latency (milliseconds)"""
+    from concurrent.futures import ThreadPoolExecutor as Pool
+    from urllib.request import Request, urlopen
+
+    def inner(i):
+        data = bytes(json.dumps(dict(text=texts[i % len(texts)])),
+                     encoding='utf-8')
+        req = Request(f'{url}/{endpoint}', data=data,
+                      headers={'Content-Type': 'application/json'})
+        start = perf_counter()
+        with urlopen(req) as response:
+            json.loads(response.read())
+        return perf_counter() - start
+
+    start = perf_counter()
+    with Pool(max_workers=concurrency) as pool:
+        times = np.array(list(pool.map(inner, range(requests)))) * 1000
+    elapsed = perf_counter() - start
+    return dict(requests=requests, concurrency=concurrency,
+                seconds=elapsed, throughput=requests / elapsed,
+                p50=float(np.percentile(times, 50)),
+                p99=float(np.percentile(times, 99)))
+
+
+def main(args=None):
+    """Command line interface"""
+    import argparse
+    parser = argparse.ArgumentParser(description='DialectId micro-batching HTTP server')
+    parser.add_argument('-l', '--lang', default='es')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8080)
+    parser.add_argument('--probability', action='store_true')
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        dest='max_batch_size')
+    parser.add_argument('--max-wait-ms', type=float, default=5,
+                        dest='max_wait_ms')
+    parser.add_argument('--executor', default='thread',
+                        choices=['thread', 'process'])
+    parser.add_argument('--n-jobs', type=int, default=-1, dest='n_jobs')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Per-stage timers and counters at GET /metrics')
+    parser.add_argument('--load-test', action='store_true', dest='load_test',
+                        help='Run the load test against a running server')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args(args)
+    if args.load_test:
+        output = load_test(url=f'http://{args.host}:{args.port}',
+                           requests=args.requests,
+                           concurrency=args.concurrency)
+        print(json.dumps(output))
+        return
+    model = DialectId(lang=args.lang, probability=args.probability,
+                      use_tqdm=False)
+    model.weights
+    if args.metrics:
+        from dialectid.metrics import Metrics
+        model.metrics = Metrics()
+    server = Server(model, host=args.host, port=args.port,
+                    max_batch_size=args.max_batch_size,
+                    max_wait_ms=args.max_wait_ms,
+                    executor=args.executor, n_jobs=args.n_jobs)
+    server.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from os.path import isfile, dirname, join
+from tempfile import mkstemp
+import gzip
+import hashlib
+import os
+from microtc.utils import tweet_iterator
+from dialectid.utils import BASEURL, COUNTRIES
+
+MODELS = join(dirname(__file__), 'models')
+ENV_MODELS = 'DIALECTID_MODELS'
+ENV_OFFLINE = 'DIALECTID_OFFLINE'
+
+
+def model_dir(path: str=None):
+    """Models' directory: `path`, the environment
+    variable DIALECTID_MODELS, or the package's directory"""
+    if path is not None:
+        return path
+    return os.environ.get(ENV_MODELS, MODELS)
+
+
+def is_offline(offline: bool=None):
+    """Offline mode: `offline` or the environment variable DIALECTID_OFFLINE"""
+    if offline is not None:
+        return offline
+    return os.environ.get(ENV_OFFLINE, '0').lower() in ('1', 'true', 'yes')
+
+
+def sha256(filename: str):
+    """SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as fpt:
+        for block in iter(lambda: fpt.read(2**20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def verify(filename: str):
+    """Test the file against its checksum (`filename`.sha256);
+    files without checksum are accepted."""
+    checksum = f'{filename}.sha256'
+    if not isfile(checksum):
+        return True
+    with open(checksum, encoding='utf-8') as fpt:
+        return fpt.read().strip() == sha256(filename)
+
+
+def _replace(data: str, filename: str):
+    """Atomic write of `data` into `filename`"""
+    fd, tmp = mkstemp(dir=dirname(filename) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fpt:
+            fpt.write(data)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def published_checksum(url: str):
+    """Checksum published next to `url`, i.e., `url`.sha256 (the output
+    of sha256sum); None when the model was published without it"""
+    from urllib.error import URLError
+    from urllib.request import urlopen
+    try:
+        with urlopen(f'{url}.sha256') as fpt:
+            return fpt.read().decode('utf-8').split()[0]
+    except URLError as error:
+        if getattr(error, 'code', None) == 404 or\
+           isinstance(error.reason, FileNotFoundError):
+            return None
+        raise
+
+
+def fetch(identifier: str, base_url: str=BASEURL,
+          outputdir: str=None, offline: bool=None):
+    """Path of the model `identifier` in the cache; the model is
+    downloaded, when it is missing, unless the offline mode is on.
+    The download is written into a temporary file, checked against
+    the checksum published with the model (see :py:func:`published_checksum`),
+    and then moved into the cache with its checksum. A cached file that
+    does not match its checksum is removed and downloaded again; it raises
+    ValueError in offline mode, as does a download that does not match."""
+    from encexp.utils import Download
+    outputdir = model_dir(outputdir)
+    output = join(outputdir, f'{identifier}.json.gz')
+    if isfile(output):
+        if verify(output):
+            return output
+        if is_offline(offline):
+            raise ValueError(f'{output} does not match its checksum')
+        os.unlink(output)
+    if is_offline(offline):
+        raise FileNotFoundError(f'{output} is not in the cache (offline mode)')
+    os.makedirs(outputdir, exist_ok=True)
+    url = f'{base_url}/{identifier}.json.gz'
+    checksum = published_checksum(url)
+    fd, tmp = mkstemp(dir=outputdir, suffix='.tmp')
+    os.close(fd)
+    try:
+        Download(url, tmp)
+        if checksum is not None and sha256(tmp) != checksum:
+            raise ValueError(f'{url} does not match its published checksum')
+        with gzip.open(tmp, 'rb') as fpt:
+            while fpt.read(2**20):
+                pass
+        _replace(sha256(tmp) if checksum is None else checksum,
+                 f'{output}.sha256')
+        os.replace(tmp, output)
+    finally:
+        if isfile(tmp):
+            os.unlink(tmp)
+    return output
+
+
+def download(identifier: str, first: bool=True, **kwargs):
+    """Model `identifier` from the cache (see :py:func:`fetch`)"""
+    path = fetch(identifier, **kwargs)
+    if first:
+        return next(tweet_iterator(path))
+    return tweet_iterator(path)
+
+
+def prefetch(langs: list=None, outputdir: str=None,
+             binary: bool=False):
+    """Download the models of `langs` (default: the languages with more
+    than one country) into the cache; `binary` also stores the models
+    in the binary format (see :py:mod:`dialectid.binary`).
+    It returns the status of each language."""
+    from dialectid.model import DialectId
+    if langs is None:
+        langs = [k for k, v in COUNTRIES.items() if len(v) > 1]
+    output = {}
+    for lang in langs:
+        try:
+            model = DialectId(lang=lang, model_dir=outputdir, use_tqdm=False)
+            model.weights
+            model.seqTM
+            output[lang] = 'ok'
+            if binary:
+                from dialectid.binary import save
+                filename = join(model_dir(outputdir),
+                                f'{model.identifier}.dialectid')
+                save(model, filename)
+                _replace(sha256(filename), f'{filename}.sha256')
+        except Exception as error:
+            output[lang] = f'error: {error}'
+    return output
+
+
+def main(args=None):
+    """Command line interface to :py:func:`prefetch`"""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description='Download the DialectId models into the cache')
+    parser.add_argument('-l', '--lang', nargs='+', default=None, dest='langs')
+    parser.add_argument('-o', '--output', default=None,
+                        help=f'cache directory; default ${ENV_MODELS} or {MODELS}')
+    parser.add_argument('--binary', action='store_true',
+                        help='store also the binary format')
+    args = parser.parse_args(args)
+    output = prefetch(langs=args.langs, outputdir=args.output,
+                      binary=args.binary)
+    print(json.dumps(output, indent=2))
+    if any(v != 'ok' for v in output.values()):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
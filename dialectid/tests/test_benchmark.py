@@ -0,0 +1,71 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+import json
+import os
+from dialectid.model import DialectId
+from dialectid import benchmark
+
+
+def test_synthetic_corpus():
+    """Test synthetic_corpus"""
+    dial = DialectId(lang='es')
+    texts = benchmark.synthetic_corpus(dial, size=10, min_words=2,
+                                       max_words=3)
+    assert len(texts) == 10
+    for text in texts:
+        assert 2 <= len(text.split()) <= 3
+
+
+def test_allocations():
+    """Test allocations"""
+    dial = DialectId(lang='es', probability=True)
+    texts = benchmark.synthetic_corpus(dial, size=32)
+    output = benchmark.allocations(dial, texts, batch_size=16)
+    assert [x['method'] for x in output] == ['decision_function',
+                                             'predict_proba', 'positive']
+    for res in output:
+        assert res['batch_size'] == 16
+        assert 0 <= res['temporaries'] <= res['peak']
+
+
+def test_run():
+    """Test run"""
+    output = benchmark.run(langs=['es'], size=16, batch_sizes=[1, 8],
+                           latency_size=4, probability=True)
+    res = output['results']['es']
+    assert res['load'] > 0
+    assert len(res['throughput']) == 4 * 2
+    assert res['latency']['n'] == 4
+    assert len(res['allocations']) == 3
+    assert res['memory'] > 0
+    json.dumps(output)
+
+
+def test_main():
+    """Test main"""
+    benchmark.main(['-l', 'es', '-n', '8', '-b', '4',
+                    '-o', 'benchmark.json'])
+    with open('benchmark.json', encoding='utf-8') as fpt:
+        output = json.load(fpt)
+    assert 'es' in output['results']
+    os.unlink('benchmark.json')
@@ -0,0 +1,74 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from numpy.testing import assert_almost_equal
+import numpy as np
+from encexp.utils import load_dataset
+from dialectid.model import DialectId
+from dialectid.binary import save, load, convert, read_header
+import os
+
+
+def test_binary_save_load():
+    """Test binary save and load"""
+    dial = DialectId(lang='es', probability=True)
+    save(dial, 'es.dialectid')
+    header = read_header('es.dialectid')
+    assert header['params']['lang'] == 'es'
+    for value in header['arrays'].values():
+        assert value['offset'] % 64 == 0
+    dial2 = load('es.dialectid')
+    assert isinstance(dial2.weights, np.memmap)
+    assert isinstance(dial2.seqTM.model.wordWeight, np.memmap)
+    assert dial2.identifier == dial.identifier
+    texts = ['comiendo unos tacos', 'pibe']
+    assert_almost_equal(dial.transform(texts), dial2.transform(texts))
+    assert_almost_equal(dial.predict_proba(texts),
+                        dial2.predict_proba(texts))
+    assert np.all(dial.predict(texts) == dial2.predict(texts))
+    tokens = dial.seqTM.tokenize(texts[0])
+    assert_almost_equal([v for _, v in dial.seqTM.model[tokens]],
+                        [v for _, v in dial2.seqTM.model[tokens]])
+    dial3 = load('es.dialectid', mmap=False, probability=False)
+    assert not isinstance(dial3.weights, np.memmap)
+    assert not dial3.probability
+    os.unlink('es.dialectid')
+
+
+def test_binary_convert():
+    """Test convert json.gz into binary"""
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    enc = DialectId(lang='es', pretrained=False, probability=True)
+    enc.tailored(D, tsv_filename='tailored.tsv',
+                 min_pos=32,
+                 filename='tailored_binary.json.gz',
+                 self_supervised=False)
+    output = convert('tailored_binary.json.gz', lang='es',
+                     probability=True)
+    assert output == 'tailored_binary.dialectid'
+    enc2 = load(output)
+    assert_almost_equal(enc.proba_coefs[0], enc2.proba_coefs[0])
+    texts = ['comiendo unos tacos', 'pibe']
+    assert_almost_equal(enc.predict_proba(texts), enc2.predict_proba(texts))
+    for fname in [output, 'tailored_binary.json.gz', 'tailored.tsv']:
+        os.unlink(fname)
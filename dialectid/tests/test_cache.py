@@ -0,0 +1,53 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from numpy.testing import assert_almost_equal
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.cache import Cache
+
+
+def test_Cache():
+    """Test Cache"""
+    cache = Cache(max_entries=2)
+    for text in ['a', 'b', 'c']:
+        cache.put(cache.key(text), np.ones(3))
+    assert len(cache) == 2 and cache.nbytes == 2 * 3 * 8
+    assert cache.get(cache.key('a')) is None
+    assert cache.key('b') == cache.key(dict(text='b'))
+    cache = Cache(max_bytes=3 * 8)
+    for text in ['a', 'b']:
+        cache.put(cache.key(text), np.ones(3))
+    assert len(cache) == 1
+
+
+def test_DialectId_cache():
+    """Test DialectId with cache"""
+    texts = ['comiendo unos tacos', 'pibe', 'comiendo unos tacos']
+    dial = DialectId(lang='es')
+    X = dial.transform(texts)
+    dial.cache = Cache()
+    assert_almost_equal(dial.transform(texts), X)
+    assert dial.cache.hits == 1 and dial.cache.misses == 2
+    hy = dial.positive(texts[:2])
+    assert dial.cache.hits == 3 and dial.cache.misses == 2
+    assert hy == DialectId(lang='es').positive(texts[:2])
@@ -0,0 +1,145 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+import os
+from tempfile import mkstemp
+import numpy as np
+from dialectid.hashing import HashedVocabulary, sparse_projection
+from dialectid.model import BoW, DialectId
+from dialectid import binary, lite
+from encexp.utils import load_dataset
+
+CORPUS = ['comiendo unos tacos', 'que onda guey', 'pibe che boludo',
+          'vale tio mola', 'quiero unos tacos al pastor',
+          'che pibe vamos', 'tio que guay']
+LABELS = ['mx', 'mx', 'ar', 'es', 'mx', 'ar', 'es']
+
+
+def test_HashedVocabulary():
+    """Test HashedVocabulary"""
+
+    vocabulary = HashedVocabulary(2**10, cache_size=2)
+    assert vocabulary['tacos'] == vocabulary.get('tacos')
+    assert vocabulary['tacos'] == HashedVocabulary(2**10)['tacos']
+    assert vocabulary['tacos'] != HashedVocabulary(2**10, seed=1)['tacos']
+    assert 'pibe' in vocabulary and len(vocabulary) == 2**10
+    for token in ['a', 'b', 'c']:
+        assert 0 <= vocabulary[token] < 2**10
+    assert len(list(vocabulary)) == 2
+
+
+def test_sparse_projection():
+    """Test sparse_projection"""
+
+    R = sparse_projection(128, 16, n_nonzero=4)
+    assert R.shape == (128, 16)
+    assert np.all(np.diff(R.indptr) <= 4)
+    assert (R != sparse_projection(128, 16, n_nonzero=4)).nnz == 0
+
+
+def test_BoW_hashing():
+    """Test BoW with the hashing trick"""
+
+    bow = BoW(lang='es', pretrained=False, n_buckets=64).fit(CORPUS)
+    X = bow.transform(CORPUS)
+    assert X.shape == (len(CORPUS), 64) and bow.weights.shape[0] == 64
+    assert np.allclose(X.multiply(X).sum(axis=1), 1)
+    bow = BoW(lang='es', pretrained=False, n_buckets=64,
+              n_components=16).fit(CORPUS)
+    assert bow.transform(CORPUS).shape == (len(CORPUS), 16)
+    assert BoW(lang='es', pretrained=False, n_buckets=64).identifier == \
+        BoW(lang='es', pretrained=False).identifier
+
+
+def test_DialectId_hashing():
+    """Test DialectId with hashed features and projection"""
+    from sklearn.svm import LinearSVC
+
+    bow = BoW(lang='es', pretrained=False, n_buckets=64,
+              n_components=16).fit(CORPUS)
+    X = bow.transform(CORPUS)
+    m = LinearSVC().fit(X, LABELS)
+    data = [dict(coef=coef.astype(np.float16).tobytes().hex(), label=label,
+                 intercept=np.float16(inter).reshape(1).tobytes().hex())
+            for coef, label, inter in zip(m.coef_, m.classes_, m.intercept_)]
+    detect = DialectId(lang='es', pretrained=False, n_buckets=64,
+                       n_components=16)
+    assert detect.identifier != DialectId(lang='es').identifier
+    detect.seqTM = bow
+    detect.set_weights(data)
+    assert detect.weights.shape == (64, 3)
+    assert np.all(detect.predict(CORPUS) == m.predict(X))
+    df = detect.decision_function(CORPUS)
+    fd, filename = mkstemp(suffix='.dialectid')
+    os.close(fd)
+    binary.save(detect, filename)
+    for model in [binary.load(filename), lite.load(filename)]:
+        assert np.allclose(model.decision_function(CORPUS), df, atol=1e-5)
+    os.unlink(filename)
+
+
+def test_HashedTFIDF_fold():
+    """Test HashedTFIDF fold uses the projection"""
+
+    bow = BoW(lang='es', pretrained=False, n_buckets=64,
+              n_components=16).fit(CORPUS)
+    weights = np.random.default_rng(0).normal(size=(16, 3))
+    model = bow.model
+    assert np.allclose(model.fold(weights), model.projection @ weights)
+    model._projection = model.projection * 2
+    assert np.allclose(model.fold(weights), model.projection @ weights)
+
+
+def test_DialectId_tailored_hashing():
+    """Test DialectId tailored with hashed features and projection"""
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    for config in [dict(n_buckets=2**12),
+                   dict(n_buckets=2**12, n_components=64)]:
+        detect = DialectId(lang='es', pretrained=False, probability=True,
+                           **config)
+        detect.tailored(D, tsv_filename='tailored_hashing.tsv', min_pos=32,
+                        filename='tailored_hashing.json.gz',
+                        self_supervised=False)
+        assert detect.weights.shape == (2**12, 3)
+        assert (detect.predict(X) == np.array(y)).mean() > 0.5
+        assert np.allclose(detect.predict_proba(X[:5]).sum(axis=1), 1)
+        for fname in ['tailored_hashing.tsv', 'tailored_hashing.json.gz']:
+            os.unlink(fname)
+
+
+def test_hashing_tradeoff():
+    """Test benchmark.hashing_tradeoff"""
+    from dialectid.benchmark import hashing_tradeoff
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    output = hashing_tradeoff(D[::2], D[1::2],
+                              configs=[dict(n_buckets=2**12),
+                                       dict(n_buckets=2**12, n_components=64)],
+                              batch_size=32, lang='es')
+    assert len(output) == 3
+    assert output[0]['n_buckets'] is None
+    assert [x['n_components'] for x in output] == [None, None, 64]
+    for row in output:
+        assert 0 <= row['accuracy'] <= 1
+        assert row['throughput'] > 0 and row['training'] > 0
@@ -0,0 +1,75 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from numpy.testing import assert_almost_equal
+import subprocess
+import sys
+import json
+import os
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.binary import save
+from dialectid import lite
+
+IMPORT_BUDGET = 2.0
+
+
+def test_softmax_expit_normalize():
+    """Test the NumPy replacements of scikit-learn/SciPy functions"""
+    from sklearn.utils.extmath import softmax
+    from sklearn.preprocessing import Normalizer
+    from scipy.special import expit
+    X = np.random.normal(size=(10, 4))
+    X[0] = 0
+    assert_almost_equal(lite.softmax(X.copy()), softmax(X))
+    assert_almost_equal(lite.expit(X), expit(X))
+    assert_almost_equal(lite.normalize(X), Normalizer().transform(X))
+
+
+def test_DialectIdLite():
+    """Test DialectIdLite"""
+    texts = ['comiendo unos tacos', 'pibe', 'Hola @user 😀 ¿qué tal?', '']
+    dial = DialectId(lang='es', probability=True)
+    save(dial, 'es-lite.dialectid')
+    dial2 = lite.load('es-lite.dialectid')
+    for text in texts:
+        assert dial.seqTM.tokenize(text) == dial2.seqTM.tokenize(text)
+    assert_almost_equal(dial.transform(texts), dial2.transform(texts),
+                        decimal=5)
+    assert_almost_equal(dial.predict_proba(texts),
+                        dial2.predict_proba(texts), decimal=5)
+    assert np.all(dial.predict(texts) == dial2.predict(texts))
+    assert dial.positive(texts, k=2) == dial2.positive(texts, k=2)
+    os.unlink('es-lite.dialectid')
+
+
+def test_import_budget():
+    """Test the inference path does not import scikit-learn and its import time"""
+    code = ('import sys, time, json; start = time.perf_counter(); '
+            'import dialectid; import dialectid.lite; '
+            'print(json.dumps(dict(time=time.perf_counter() - start, '
+            'sklearn="sklearn" in sys.modules, encexp="encexp" in sys.modules)))')
+    output = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True)
+    output = json.loads(output.stdout)
+    assert not output['sklearn'] and not output['encexp']
+    assert output['time'] < IMPORT_BUDGET
@@ -0,0 +1,84 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+import pickle
+from dialectid.model import DialectId
+from dialectid.metrics import Metrics
+
+
+def test_Metrics():
+    """Test Metrics"""
+    calls = []
+    metrics = Metrics(buckets=(1, 4))
+    metrics.add_hook(lambda *args: calls.append(args), stage='predict')
+    metrics.observe('predict', 0.5, 3)
+    metrics.observe('predict', 0.25, 10)
+    metrics.observe('transform', 0.1, 1)
+    metrics.count('tokens', 7)
+    output = metrics.to_dict()
+    predict = output['stages']['predict']
+    assert predict['calls'] == 2 and predict['texts'] == 13
+    assert predict['seconds'] == 0.75 and predict['max_seconds'] == 0.5
+    assert predict['batch_sizes'] == [0, 1, 1]
+    assert output['counters'] == dict(tokens=7)
+    assert calls == [('predict', 0.5, 3), ('predict', 0.25, 10)]
+    text = metrics.prometheus()
+    assert 'dialectid_batch_size_bucket{stage="predict",le="4"} 1' in text
+    assert 'dialectid_batch_size_bucket{stage="predict",le="+Inf"} 2' in text
+    assert 'dialectid_tokens_total 7' in text
+    metrics.clear()
+    assert metrics.to_dict()['stages'] == {}
+
+
+def test_DialectId_metrics():
+    """Test the instrumentation of DialectId"""
+    dial = DialectId(lang='es')
+    assert dial.metrics is None
+    dial.metrics = Metrics()
+    texts = ['comiendo unos tacos', 'pibe']
+    dial.predict(texts)
+    dial.positive(iter(texts))
+    output = dial.metrics.to_dict()
+    assert output['stages']['predict']['texts'] == 2
+    assert output['stages']['positive']['texts'] == 2
+    assert output['stages']['transform']['calls'] == 2
+    assert output['counters']['tokens'] > 0
+    dial2 = pickle.loads(pickle.dumps(dial))
+    assert dial2.metrics is None
+
+
+def test_DialectId_metrics_stages():
+    """Test the internal stages (tokenize, project, proba, positive_dicts)"""
+    dial = DialectId(lang='es', probability=True)
+    dial.metrics = Metrics()
+    texts = ['comiendo unos tacos', 'pibe', 'vale tio']
+    dial.positive(texts)
+    stages = dial.metrics.to_dict()['stages']
+    for stage in ['tokenize', 'project', 'proba', 'positive_dicts']:
+        assert stages[stage]['calls'] == 1
+        assert stages[stage]['texts'] == 3
+        assert stages[stage]['seconds'] <= stages['positive']['seconds']
+    dial.metrics.clear()
+    dial.decision_function(texts)
+    stages = dial.metrics.to_dict()['stages']
+    assert 'proba' not in stages and 'positive_dicts' not in stages
+    assert stages['tokenize']['calls'] == stages['project']['calls'] == 1
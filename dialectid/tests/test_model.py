@@ -25,6 +25,7 @@ from sklearn.preprocessing import Normalizer
 from microtc.utils import tweet_iterator
 from dialectid.model import DialectId
 from encexp.utils import load_dataset
+import numpy as np
 import os
 
 
@@ -153,4 +154,267 @@ def test_DialectId_positive():
     assert len(output2) == len(output1)
     for probability in [True, False]:
         dial = DialectId(lang='tr', probability=probability)
-        dial.positive(['comiendo unos tacos'])
\ No newline at end of file
+        dial.positive(['comiendo unos tacos'])
+
+def test_DialectId_predict_all():
+    """Test DialectId predict_all"""
+    texts = ['comiendo unos tacos', 'pibe']
+    dial = DialectId(lang='es', probability=True)
+    output = dial.predict_all(texts,
+                              outputs=('predict', 'decision_function',
+                                       'predict_proba', 'positive'),
+                              margin=1)
+    assert np.all(output['predict'] == dial.predict(texts))
+    assert_almost_equal(output['decision_function'],
+                        dial.decision_function(texts))
+    assert_almost_equal(output['predict_proba'],
+                        dial.predict_proba(texts))
+    for mask, pos in zip(output['positive'],
+                         dial.positive(texts, margin=1)):
+        assert set(dial.countries[mask]) == set(pos)
+    output = DialectId(lang='es').predict_all(texts, outputs=('predict', ))
+    assert list(output) == ['predict']
+
+
+def test_DialectId_positive_columnar():
+    """Test DialectId positive in CSR format"""
+    texts = ['comiendo unos tacos', 'pibe']
+    dial = DialectId(lang='es')
+    output = dial.positive(texts)
+    indptr, indices, scores = dial.positive(texts, columnar=True)
+    assert indptr.shape[0] == len(texts) + 1
+    for start, end, pos in zip(indptr[:-1], indptr[1:], output):
+        labels = dial.countries[indices[start:end]]
+        assert set(labels) == set(pos)
+        for label, score in zip(labels, scores[start:end]):
+            assert pos[label] == score
+    top = dial.positive(texts, k=2)
+    for pos, pos2 in zip(output, top):
+        assert len(pos2) <= 2
+        best = sorted(pos.items(), key=lambda x: x[1], reverse=True)[:2]
+        assert list(pos2.items()) == best
+
+
+def test_DialectId_stream():
+    """Test DialectId predict_stream, positive_stream, and predict_file"""
+    import gzip
+    import json
+    texts = ['comiendo unos tacos', 'pibe', 'vale tio']
+    dial = DialectId(lang='es')
+    hy = dial.predict_stream(iter(texts), batch_size=2)
+    assert list(hy) == dial.predict(texts).tolist()
+    D = [dict(text=text) for text in texts]
+    hy = dial.positive_stream(iter(D), batch_size=2)
+    assert list(hy) == dial.positive(texts)
+    with gzip.open('stream.json.gz', 'wt') as fpt:
+        for tweet in D:
+            fpt.write(json.dumps(tweet) + '\n')
+    dial.predict_file('stream.json.gz', 'stream-output.json.gz',
+                      batch_size=2)
+    output = list(tweet_iterator('stream-output.json.gz'))
+    assert [x['text'] for x in output] == texts
+    assert [x['dialect'] for x in output] == dial.predict(texts).tolist()
+    os.unlink('stream.json.gz')
+    os.unlink('stream-output.json.gz')
+
+
+def test_DialectId_tailored_df_filename():
+    """Test DialectId tailored storing the out-of-fold decision function"""
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    enc = DialectId(lang='es', pretrained=False, probability=True)
+    enc.tailored(D, tsv_filename='tailored.tsv',
+                 min_pos=32, n_jobs=2,
+                 filename='tailored_df.json.gz',
+                 df_filename='tailored_df.npy',
+                 self_supervised=False)
+    df = np.load('tailored_df.npy')
+    assert df.shape == (len(D), 3)
+    os.unlink('tailored_df.json.gz')
+    enc2 = DialectId(lang='es', pretrained=False, probability=True)
+    enc2.tailored(D, tsv_filename='tailored.tsv',
+                  min_pos=32,
+                  filename='tailored_df.json.gz',
+                  df_filename='tailored_df.npy',
+                  self_supervised=False)
+    assert_almost_equal(enc.proba_coefs[0], enc2.proba_coefs[0])
+    enc2.calibrate(df, np.array(y))
+    assert_almost_equal(enc.proba_coefs[0], enc2.proba_coefs[0])
+    for fname in ['tailored_df.json.gz', 'tailored_df.npy', 'tailored.tsv']:
+        os.unlink(fname)
+
+
+def test_DialectId_tailored_identifier():
+    """Test DialectId tailored without filename"""
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    enc = DialectId(lang='es', pretrained=False, probability=True)
+    enc.tailored(D, min_pos=32, self_supervised=False)
+    filename = f'{enc.identifier}.json.gz'
+    assert os.path.isfile(filename)
+    enc2 = DialectId(lang='es', pretrained=False, probability=True)
+    enc2.tailored()
+    assert_almost_equal(enc.proba_coefs[0], enc2.proba_coefs[0])
+    assert_almost_equal(enc.predict_proba(X[:10]), enc2.predict_proba(X[:10]),
+                        decimal=2)
+    os.unlink(filename)
+
+
+def test_DialectId_cascade():
+    """Test DialectId cascade (language gate)"""
+    from dialectid.lite import NOT_LANGUAGE
+    dial = DialectId(lang='es', probability=True)
+    texts = ['comiendo unos tacos', 'que onda guey']
+    outputs = ('predict', 'predict_proba', 'positive')
+    output = dial.cascade(texts, threshold=0, outputs=outputs)
+    assert output['gate'].all()
+    assert output['predict'].tolist() == dial.predict(texts).tolist()
+    assert_almost_equal(output['predict_proba'], dial.predict_proba(texts))
+    output = dial.cascade(texts, threshold=1.1, outputs=outputs)
+    assert not output['gate'].any()
+    assert (output['predict'] == NOT_LANGUAGE).all()
+    assert np.isnan(output['predict_proba']).all()
+    assert not output['positive'].any()
+    assert dial.cascade_stats == dict(texts=4, exits=2)
+
+
+def test_DialectId_cascade_language():
+    """Test the language gate with in-language and off-language texts"""
+    from dialectid.lite import NOT_LANGUAGE
+    spanish = ['me voy a comer unos tacos con mis amigos',
+               'el partido de futbol estuvo muy bueno']
+    turkish = ['bu aksam arkadaslarimla yemek yiyecegim',
+               'futbol maci cok guzeldi']
+    dial = DialectId(lang='tr')
+    output = dial.cascade(spanish + turkish)
+    assert output['gate'].tolist() == [False, False, True, True]
+    assert (output['predict'][:2] == NOT_LANGUAGE).all()
+    dial = DialectId(lang='es')
+    output = dial.cascade(spanish + turkish)
+    assert output['gate'].tolist() == [True, True, False, False]
+
+
+def test_DialectId_top_k():
+    """Test DialectId top_k"""
+    dial = DialectId(lang='es')
+    texts = ['comiendo unos tacos', 'que onda guey', 'pibe']
+    index, scores = dial.top_k(texts, k=3)
+    assert index.shape == scores.shape == (3, 3)
+    assert dial.countries[index[:, 0]].tolist() == dial.predict(texts).tolist()
+    df = dial.decision_function(texts)
+    assert_almost_equal(np.take_along_axis(df, index, axis=1), scores,
+                        decimal=5)
+    assert (np.diff(scores, axis=1) <= 0).all()
+    columns = dial.active_columns(texts)
+    index2, scores2 = dial.top_k(texts, k=1, columns=columns)
+    assert_almost_equal(scores2[:, 0], df[:, columns].max(axis=1),
+                        decimal=5)
+    assert_almost_equal(scores2[:, 0], scores[:, 0], decimal=5)
+
+
+def test_DialectId_update():
+    """Test DialectId update"""
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    dial = DialectId(lang='es', probability=True)
+    remove = [x for x in dial.countries if x not in ('mx', 'ar', 'es')]
+    dial.update(D, filename='update.json.gz', remove=remove)
+    assert dial.artifact == 'update.v1.json.gz'
+    assert dial.countries.tolist() == ['ar', 'es', 'mx']
+    dial2 = DialectId(lang='es', pretrained=False, probability=True)
+    dial2.tailored(filename=dial.artifact)
+    assert_almost_equal(dial2.predict_proba(X[:10]),
+                        dial.predict_proba(X[:10]), decimal=2)
+    weights = dial.weights.copy()
+    dial.update(D, refit=[], filename='update.json.gz')
+    assert dial.artifact == 'update.v2.json.gz'
+    assert_almost_equal(dial.weights, weights)
+    for fname in ['update.v1.json.gz', 'update.v2.json.gz']:
+        os.unlink(fname)
+
+
+def test_DialectId_update_warm_start():
+    """Test DialectId update stays close to the model on the old data"""
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    old, new = D[::2], D[1::2]
+    dial = DialectId(lang='es', pretrained=False, probability=True)
+    dial.tailored(old, tsv_filename='tailored.tsv', min_pos=32,
+                  filename='warm_start.json.gz', self_supervised=False)
+    texts = [x['text'] for x in old]
+    hy = dial.predict(texts)
+    weights = dial.weights.copy()
+    dial.update(new, filename='warm_start.json.gz')
+    assert (dial.predict(texts) == hy).mean() >= 0.9
+    assert np.linalg.norm(dial.weights - weights) < 0.5 * np.linalg.norm(weights)
+    for fname in ['warm_start.json.gz', 'warm_start.v1.json.gz', 'tailored.tsv']:
+        os.unlink(fname)
+
+
+def test_DialectId_tailored_stream():
+    """Test DialectId tailored from a JSON-lines file"""
+    import gzip
+    import json
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    with gzip.open('tailored_stream.json.gz', 'wt', encoding='utf-8') as fpt:
+        for text, klass in zip(X, y):
+            print(json.dumps(dict(text=text, klass=klass)), file=fpt)
+    enc = DialectId(lang='es', pretrained=False, probability=True)
+    enc.tailored('tailored_stream.json.gz', tsv_filename='tailored.tsv',
+                 min_pos=32, filename='tailored_model.json.gz',
+                 df_filename='tailored_df.npy', max_per_class=100,
+                 chunk_size=64, self_supervised=False)
+    df = np.load('tailored_df.npy')
+    assert df.shape == (300, 3)
+    assert enc.predict(X[:2]).shape[0] == 2
+    for fname in ['tailored_stream.json.gz', 'tailored_model.json.gz',
+                  'tailored_df.npy', 'tailored.tsv']:
+        os.unlink(fname)
+
+
+def test_DialectId_tailored_stream_calibration():
+    """Test the calibration streamed from files equals the one of a list"""
+    import gzip
+    import json
+    X, y = load_dataset(['mx', 'ar', 'es'], return_X_y=True)
+    D = [dict(text=text, klass=klass) for text, klass in zip(X, y)]
+    with gzip.open('tailored_stream.json.gz', 'wt', encoding='utf-8') as fpt:
+        for x in D:
+            print(json.dumps(x), file=fpt)
+    enc = DialectId(lang='es', pretrained=False, probability=True)
+    enc.tailored(D, tsv_filename='tailored.tsv', min_pos=32,
+                 filename='tailored_list.json.gz', self_supervised=False)
+    for kwargs in [dict(Dprob='tailored_stream.json.gz'),
+                   dict(Dprob='tailored.tsv')]:
+        enc2 = DialectId(lang='es', pretrained=False, probability=True)
+        enc2.tailored(iter(D), tsv_filename='tailored.tsv', min_pos=32,
+                      filename='tailored_file.json.gz', self_supervised=False,
+                      **kwargs)
+        assert_almost_equal(enc.proba_coefs[0], enc2.proba_coefs[0],
+                            decimal=4)
+        os.unlink('tailored_file.json.gz')
+    for fname in ['tailored_stream.json.gz', 'tailored_list.json.gz',
+                  'tailored.tsv']:
+        os.unlink(fname)
+
+
+def test_DialectId_design_matrix_normalized():
+    """Test the calibration features of the raw texts and the TSV"""
+    from dialectid.model import BoW
+    from dialectid.utils import dataset_iterator
+    D = [dict(text='Hola @usuario, mira https://x.co/a 😀!!', klass='mx'),
+         dict(text='¿Qué onda, güey? #tacos', klass='mx'),
+         dict(text='Che pibe... ¡vamos!', klass='ar')]
+    enc = DialectId(lang='es', pretrained=False)
+    enc.seqTM = BoW(lang='es', pretrained=False).fit([x['text'] for x in D])
+    with open('normalized.tsv', 'w', encoding='utf-8') as fpt:
+        for x in D:
+            text = enc.seqTM.text_transformations(x['text'])
+            print(f"{x['klass']}\t{text}", file=fpt)
+    X = enc.design_matrix(D)
+    Xtsv = enc.design_matrix(dataset_iterator('normalized.tsv'),
+                             normalized=True)
+    assert (X != Xtsv).nnz == 0
+    Xtwice = enc.design_matrix(dataset_iterator('normalized.tsv'))
+    assert (X != Xtwice).nnz > 0
+    os.unlink('normalized.tsv')
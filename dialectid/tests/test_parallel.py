@@ -0,0 +1,49 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from numpy.testing import assert_almost_equal
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.parallel import ParallelDialectId, scaling
+
+
+def test_ParallelDialectId():
+    """Test ParallelDialectId"""
+    texts = ['comiendo unos tacos', 'pibe', 'vale tio'] * 4
+    dial = DialectId(lang='es', probability=True)
+    for start_method in ['fork', 'spawn']:
+        with ParallelDialectId(dial, n_jobs=2,
+                               start_method=start_method) as pool:
+            assert '_seqTM' in dial.__dict__
+            assert '_tokenizer' in dial.__dict__
+            assert np.all(pool.predict(texts) == dial.predict(texts))
+            assert_almost_equal(pool.predict_proba(texts),
+                                dial.predict_proba(texts))
+            assert pool.positive(texts, chunk_size=5) == dial.positive(texts)
+
+
+def test_scaling():
+    """Test scaling"""
+    texts = ['comiendo unos tacos', 'pibe', 'vale tio'] * 4
+    output = scaling(DialectId(lang='es'), texts, n_jobs=[0, 2])
+    assert [x['n_jobs'] for x in output] == [0, 2]
+    assert output[0]['throughput'] > 0
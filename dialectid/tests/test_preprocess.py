@@ -0,0 +1,46 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from dialectid.preprocess import Tokenizer
+from dialectid.model import BoW
+from dialectid import lite
+
+
+TEXTS = ['Buenos días @usuario, ¿cómo estás? 😀🇲🇽 https://x.co/abc',
+         'comiendo tacos!!! 1️⃣ 1️x', '~', '', None,
+         dict(text='Ñandú #hashtag 123.45'),
+         'un\x1eseparador', 'Ça   va\ttrès\nbien :) :-P']
+
+
+def test_Tokenizer():
+    """Test Tokenizer"""
+
+    for tm in [lite.TextModel(lang='es'),
+               BoW(lang='es', pretrained=False),
+               BoW(lang='en', pretrained=False, del_diac=False)]:
+        tokenizer = Tokenizer(tm)
+        assert tokenizer.supported
+        output = tokenizer.tokenize_batch(TEXTS)
+        for text, tokens in zip(TEXTS, output):
+            assert tokens == tm.tokenize(text)
+        assert tokenizer.tokenize(TEXTS[0]) == output[0]
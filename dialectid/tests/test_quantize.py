@@ -0,0 +1,63 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from numpy.testing import assert_almost_equal
+import numpy as np
+from dialectid.model import DialectId
+from dialectid.quantize import quantize, dequantize, column_norm, evaluate
+
+
+def test_quantize():
+    """Test quantize"""
+    W = np.random.normal(size=(100, 3)).astype(np.float32)
+    Q, scale = quantize(W, method='int8')
+    assert Q.dtype == np.int8 and scale.shape == (3, )
+    assert np.fabs(dequantize(Q, scale) - W).max() <= scale.max()
+    assert_almost_equal(column_norm(W), np.linalg.norm(W, axis=0),
+                        decimal=5)
+    Q, scale = quantize(W, method='float16')
+    assert Q.dtype == np.float16 and scale is None
+
+
+def test_DialectId_quantize():
+    """Test DialectId quantize"""
+    texts = ['comiendo unos tacos', 'pibe', 'vale tio']
+    dial = DialectId(lang='es')
+    for method in ['float16', 'int8']:
+        dial2 = DialectId(lang='es', quantize=method)
+        assert dial2.identifier == dial.identifier
+        assert dial2.weights.nbytes < dial.weights.nbytes
+        assert_almost_equal(dial.transform(texts),
+                            dial2.transform(texts), decimal=1)
+    dial = DialectId(lang='es', distance=True)
+    dial2 = DialectId(lang='es', distance=True, quantize='int8')
+    assert np.allclose(dial.norm, dial2.norm, rtol=1e-2)
+
+
+def test_evaluate():
+    """Test evaluate"""
+    texts = ['comiendo unos tacos', 'pibe', 'vale tio']
+    output = evaluate(texts, y=['mx', 'ar', 'es'],
+                      method='int8', lang='es')
+    assert output['agreement'] >= 0.6
+    assert output['nbytes_int8'] * 4 == output['nbytes']
+    assert 'accuracy_delta' in output
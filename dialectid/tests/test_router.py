@@ -0,0 +1,51 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from dialectid.model import DialectId
+from dialectid.router import Router, model_memory
+
+
+def test_Router():
+    """Test Router"""
+    pairs = [('comiendo unos tacos', 'es'),
+             ('the subway is late', 'en'),
+             ('pibe', 'es'),
+             ('o metro está atrasado', 'pt')]
+    router = Router(max_models=2)
+    hy = router.predict(pairs)
+    assert len(hy) == len(pairs)
+    for (text, lang), label in zip(pairs, hy):
+        assert label == DialectId(lang=lang).predict([text])[0]
+    assert list(router.models) == ['en', 'pt']
+    assert router.loads['es'] == 1
+    memory = router.memory()
+    assert set(memory) == {'en', 'pt'}
+    assert memory['en'] > 0
+    router.positive(pairs, margin=1)
+    assert list(router.models) == ['en', 'pt']
+    assert router.loads['es'] == 2
+
+
+def test_model_memory():
+    """Test model_memory"""
+    dial = DialectId(lang='es')
+    assert model_memory(dial) > dial.weights.nbytes
@@ -0,0 +1,87 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+import asyncio
+import json
+from dialectid.model import DialectId
+from dialectid.serve import Server, load_test
+
+
+def test_Server():
+    """Test Server"""
+    texts = ['comiendo unos tacos', 'pibe']
+    dial = DialectId(lang='es', probability=True)
+
+    async def inner():
+        server = Server(dial, port=0, max_batch_size=8, max_wait_ms=1)
+        await server.start()
+        body = bytes(json.dumps(dict(texts=texts)), encoding='utf-8')
+        status, payload = await server.dispatch('POST', '/predict', body)
+        assert status == 200
+        assert payload['predict'] == dial.predict(texts).tolist()
+        body = bytes(json.dumps(dict(text=texts[0], margin=1)),
+                     encoding='utf-8')
+        status, payload = await server.dispatch('POST', '/positive', body)
+        assert set(payload['positive']) == set(dial.positive(texts[:1],
+                                                             margin=1)[0])
+        status, _ = await server.dispatch('GET', '/predict', b'')
+        assert status == 405
+        status, _ = await server.dispatch('POST', '/transform', body)
+        assert status == 404
+        output = await asyncio.to_thread(load_test,
+                                         f'http://127.0.0.1:{server.port}',
+                                         texts=texts, requests=20,
+                                         concurrency=4)
+        assert output['requests'] == 20
+        assert server.batcher.texts >= 23
+        await server.stop()
+    asyncio.run(inner())
+
+
+def test_Server_malformed():
+    """Test that a malformed request does not fail the valid ones"""
+    dial = DialectId(lang='es', probability=True)
+    text = 'que onda guey'
+
+    async def inner():
+        server = Server(dial, port=0, max_batch_size=8, max_wait_ms=50)
+        await server.start()
+        bodies = [dict(text=5), dict(text=text), dict(texts='hola'),
+                  dict(texts=[text, None]), dict(text=text, k='2'),
+                  dict(text=text, margin='1'), [text]]
+        paths = ['/predict', '/predict', '/predict', '/predict',
+                 '/positive', '/positive', '/predict']
+        output = await asyncio.gather(*[server.dispatch('POST', path,
+                                                        bytes(json.dumps(body),
+                                                              encoding='utf-8'))
+                                        for path, body in zip(paths, bodies)])
+        assert [status for status, _ in output] == [400, 200, 400, 400,
+                                                    400, 400, 400]
+        assert output[1][1]['predict'] == dial.predict([text]).tolist()[0]
+        submit = server.batcher.submit
+        output = await asyncio.gather(submit('predict', 5),
+                                      submit('predict', text),
+                                      return_exceptions=True)
+        assert isinstance(output[0], Exception)
+        assert output[1] == dial.predict([text]).tolist()[0]
+        await server.stop()
+    asyncio.run(inner())
@@ -0,0 +1,136 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+from tempfile import mkdtemp
+from shutil import rmtree
+from os.path import join, isfile
+import gzip
+import json
+import os
+from dialectid.model import DialectId
+from dialectid import store
+
+
+def test_store_offline():
+    """Test the offline mode and the checksum"""
+    path = mkdtemp()
+    filename = join(path, 'model.json.gz')
+    with gzip.open(filename, 'wt') as fpt:
+        fpt.write(json.dumps(dict(a=1)) + '\n')
+    assert store.download('model', outputdir=path, offline=True) == dict(a=1)
+    with open(f'{filename}.sha256', 'w', encoding='utf-8') as fpt:
+        fpt.write(store.sha256(filename))
+    assert store.verify(filename)
+    with open(f'{filename}.sha256', 'w', encoding='utf-8') as fpt:
+        fpt.write('0' * 64)
+    assert not store.verify(filename)
+    try:
+        store.fetch('model', outputdir=path, offline=True)
+        assert False
+    except ValueError:
+        pass
+    os.unlink(filename)
+    try:
+        store.fetch('model', outputdir=path, offline=True)
+        assert False
+    except FileNotFoundError:
+        pass
+    os.environ[store.ENV_OFFLINE] = '1'
+    try:
+        DialectId(lang='es', model_dir=path).weights
+        assert False
+    except FileNotFoundError:
+        pass
+    finally:
+        del os.environ[store.ENV_OFFLINE]
+    rmtree(path)
+
+
+def test_fetch_checksum():
+    """Test fetch against the published checksum"""
+    server, path = mkdtemp(), mkdtemp()
+    filename = join(server, 'model.json.gz')
+    with gzip.open(filename, 'wt') as fpt:
+        fpt.write(json.dumps(dict(a=1)) + '\n')
+    base_url = f'file://{server}'
+    assert store.published_checksum(f'{base_url}/model.json.gz') is None
+    with open(f'{filename}.sha256', 'w', encoding='utf-8') as fpt:
+        fpt.write('0' * 64 + '  model.json.gz\n')
+    try:
+        store.fetch('model', base_url=base_url, outputdir=path, offline=False)
+        assert False
+    except ValueError:
+        pass
+    assert os.listdir(path) == []
+    with open(f'{filename}.sha256', 'w', encoding='utf-8') as fpt:
+        fpt.write(store.sha256(filename) + '  model.json.gz\n')
+    output = store.fetch('model', base_url=base_url, outputdir=path,
+                         offline=False)
+    assert store.verify(output)
+    assert sorted(os.listdir(path)) == ['model.json.gz', 'model.json.gz.sha256']
+    with open(output, 'wb') as fpt:
+        fpt.write(b'corrupted')
+    try:
+        store.fetch('model', outputdir=path, offline=True)
+        assert False
+    except ValueError:
+        pass
+    assert store.download('model', base_url=base_url, outputdir=path,
+                          offline=False) == dict(a=1)
+    assert store.verify(output)
+    rmtree(server)
+    rmtree(path)
+
+
+def test_replace():
+    """Test _replace removes the temporary file on error"""
+    path = mkdtemp()
+    try:
+        store._replace(None, join(path, 'data.txt'))
+        assert False
+    except TypeError:
+        pass
+    assert os.listdir(path) == []
+    rmtree(path)
+
+
+def test_model_dir():
+    """Test model_dir"""
+    assert store.model_dir('x') == 'x'
+    os.environ[store.ENV_MODELS] = 'y'
+    assert store.model_dir() == 'y'
+    del os.environ[store.ENV_MODELS]
+    assert store.model_dir() == store.MODELS
+
+
+def test_prefetch():
+    """Test prefetch"""
+    path = mkdtemp()
+    output = store.prefetch(langs=['es'], outputdir=path, binary=True)
+    assert output['es'] == 'ok'
+    dial = DialectId(lang='es', model_dir=path)
+    filename = join(path, f'{dial.identifier}.json.gz')
+    assert isfile(filename) and store.verify(filename)
+    assert isfile(join(path, f'{dial.identifier}.dialectid'))
+    dial.weights
+    assert dial.seqTM.model_dir == path
+    rmtree(path)
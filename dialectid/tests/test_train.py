@@ -0,0 +1,109 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+import json
+import os
+from tempfile import mkdtemp
+from shutil import rmtree
+from microtc.utils import tweet_iterator
+from dialectid.train import dataset_files, content_hash, train
+from dialectid.model import DialectId
+
+
+def _dataset(path):
+    os.makedirs(os.path.join(path, 'en'))
+    with open(os.path.join(path, 'es.json'), 'w', encoding='utf-8') as fpt:
+        for i in range(10):
+            print(json.dumps(dict(text=f'hola {i}', klass='mx')), file=fpt)
+    with open(os.path.join(path, 'en', 'a.json'), 'w', encoding='utf-8') as fpt:
+        print(json.dumps(dict(text='hi', klass='us')), file=fpt)
+
+
+def test_dataset_files():
+    """Test dataset_files and content_hash"""
+
+    path = mkdtemp()
+    _dataset(path)
+    es = dataset_files(path, 'es')
+    assert es == [os.path.join(path, 'es.json')]
+    en = dataset_files(path, 'en')
+    assert en == [os.path.join(path, 'en', 'a.json')]
+    assert dataset_files(path, 'pt') == []
+    assert content_hash(es, dict(a=1)) == content_hash(es, dict(a=1))
+    assert content_hash(es, dict(a=1)) != content_hash(es, dict(a=2))
+    assert content_hash(es, dict(a=1)) != content_hash(en, dict(a=1))
+    rmtree(path)
+
+
+def test_train_up_to_date():
+    """Test train skips the up-to-date artifacts"""
+
+    path = mkdtemp()
+    _dataset(path)
+    output = os.path.join(path, 'models')
+    os.makedirs(output)
+    identifier = DialectId(lang='es', pretrained=False).identifier
+    digest = content_hash(dataset_files(path, 'es'),
+                          dict(identifier=identifier, min_pos=32,
+                               max_pos=int(2**21), max_per_class=None))
+    artifact = os.path.join(output, f'{identifier}.json.gz')
+    open(artifact, 'w').close()
+    with open(os.path.join(output, f'{identifier}.train.json'), 'w') as fpt:
+        json.dump(dict(lang='es', artifact=artifact, digest=digest,
+                       seconds=1.0, peak_rss=1), fpt)
+    es, pt = train(path, output, langs=['es', 'pt'], n_jobs=1)
+    assert es['status'] == 'up-to-date' and es['seconds'] == 1.0
+    assert pt['status'] == 'error: dataset not found'
+    rmtree(path)
+
+
+def test_train():
+    """Test train a language end to end"""
+
+    words = dict(mx='tacos guey chido neta pastor orale'.split(),
+                 ar='che pibe boludo mina laburo bondi'.split(),
+                 es='tio guay mola vale chaval curro'.split())
+    path = mkdtemp()
+    os.makedirs(os.path.join(path, 'data'))
+    filename = os.path.join(path, 'data', 'es.json')
+    with open(filename, 'w', encoding='utf-8') as fpt:
+        for i in range(90):
+            klass = ['mx', 'ar', 'es'][i % 3]
+            text = f'hola {i} ' + ' '.join(words[klass][i % 6:] + words[klass][:i % 6])
+            print(json.dumps(dict(text=text, klass=klass)), file=fpt)
+    output = os.path.join(path, 'models')
+    es, = train(os.path.join(path, 'data'), output, langs=['es'],
+                n_jobs=2, min_pos=8)
+    assert es['status'] == 'trained' and es['peak_rss'] > 0
+    data = list(tweet_iterator(es['artifact']))
+    assert len(data) == 4 and 'proba_coef' in data[-1]
+    assert os.listdir(os.path.join(output, '.work')) == []
+    es, = train(os.path.join(path, 'data'), output, langs=['es'],
+                n_jobs=2, min_pos=8)
+    assert es['status'] == 'up-to-date'
+    with open(filename, 'a', encoding='utf-8') as fpt:
+        print(json.dumps(dict(text='tacos', klass='mx')), file=fpt)
+    es, = train(os.path.join(path, 'data'), output, langs=['es'],
+                n_jobs=2, min_pos=8)
+    assert es['status'] == 'trained'
+    rmtree(path)
@@ -52,4 +52,35 @@ def test_countries():
     for k, v in utils.COUNTRIES.items():
         assert len(k) == 2
         for i in v:
-            assert len(i) == 2
\ No newline at end of file
+            assert len(i) == 2
+
+def test_batches():
+    """Test batches"""
+
+    output = list(utils.batches(iter(range(5)), batch_size=2))
+    assert output == [[0, 1], [2, 3], [4]]
+    assert list(utils.batches([], batch_size=2)) == []
+
+
+def test_reservoir():
+    """Test reservoir"""
+
+    D = [dict(klass=i % 3, i=i) for i in range(100)]
+    output = utils.reservoir(D, size=5)
+    assert len(output) == 15
+    for klass in range(3):
+        assert sum(x['klass'] == klass for x in output) == 5
+    assert output == utils.reservoir(iter(D), size=5)
+    assert len(utils.reservoir(D, size=1000)) == 100
+
+
+def test_dataset_iterator():
+    """Test dataset_iterator"""
+    import os
+    with open('dataset.tsv', 'w', encoding='utf-8') as fpt:
+        print('mx\tcomiendo unos tacos', file=fpt)
+        print('ar es\tpibe', file=fpt)
+    output = list(utils.dataset_iterator('dataset.tsv'))
+    assert output == [dict(text='comiendo unos tacos', klass='mx'),
+                      dict(text='pibe', klass='ar')]
+    os.unlink('dataset.tsv')
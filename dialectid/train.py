@@ -0,0 +1,239 @@
+# MIT License
+
+# Copyright (c) 2024 Eric Sadit Tellez Avila, Daniela Alejandra Moctezuma Ochoa, Luis Guillermo Ruiz Velazquez, Mario Graff Guerrero
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+from os.path import isdir, isfile, join
+from glob import glob
+from shutil import rmtree
+from time import perf_counter
+import multiprocessing as mp
+import hashlib
+import json
+import os
+import sys
+from microtc.utils import tweet_iterator
+from dialectid.model import DialectId
+from dialectid.utils import COUNTRIES
+from dialectid.store import sha256, _replace
+from dialectid.benchmark import peak_rss
+
+
+def dataset_files(directory: str, lang: str):
+    """JSON-lines files (optionally gzipped) of `lang` in `directory`,
+    i.e., `lang`.json, `lang`.json.gz, or the files in the directory `lang`"""
+    path = join(directory, lang)
+    if isdir(path):
+        return sorted(glob(join(path, '*.json')) +
+                      glob(join(path, '*.json.gz')))
+    return [x for x in [f'{path}.json', f'{path}.json.gz'] if isfile(x)]
+
+
+def content_hash(files: list, params: dict):
+    """SHA-256 of the files' content and the training parameters"""
+    digest = hashlib.sha256()
+    for filename in files:
+        digest.update(sha256(filename).encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _complete(filename: str):
+    """Test whether `filename` is a model with its probability coefficients"""
+    try:
+        data = list(tweet_iterator(filename))
+    except Exception:
+        return False
+    return len(data) > 1 and 'proba_coef' in data[-1]
+
+
+def _dataset(model: DialectId, D, tsv_filename: str):
+    """Create the TSV of the EncExp training (see
+    :py:func:`EncExpT.tailored`); it is written into a temporary
+    file and renamed, so an interrupted run does not leave a truncated TSV."""
+    from sklearn.base import clone
+    from encexp.build_encexp import EncExpDataset
+    if isfile(tsv_filename):
+        return tsv_filename
+    tmp = f'{tsv_filename}.tmp'
+    ds = EncExpDataset(text_model=clone(model.seqTM),
+                       self_supervised=False, use_tqdm=False)
+    ds.output_filename = tmp
+    ds.process(D)
+    os.replace(tmp, tsv_filename)
+    return tsv_filename
+
+
+def _train(lang: str, files: list, output: str, digest: str,
+           cores: int, kwargs: dict, tailored: dict):
+    """Train and calibrate the model of `lang` (worker); the
+    intermediate files (TSV, out-of-fold decision function) are kept
+    in a working directory so that a new run resumes from them."""
+    from threadpoolctl import threadpool_limits
+    from joblib.externals.loky import get_reusable_executor
+    start = perf_counter()
+    model = DialectId(lang=lang, pretrained=False, use_tqdm=False, **kwargs)
+    work = join(output, '.work', f'{lang}-{digest[:16]}')
+    for path in glob(join(output, '.work', f'{lang}-*')):
+        if path != work:
+            rmtree(path, ignore_errors=True)
+    os.makedirs(work, exist_ok=True)
+    filename = join(work, 'model.json.gz')
+    if isfile(filename) and not _complete(filename):
+        os.unlink(filename)
+    try:
+        with threadpool_limits(limits=cores):
+            tsv_filename = _dataset(model,
+                                    chain(*[tweet_iterator(x) for x in files]),
+                                    join(work, 'data.tsv'))
+            model.tailored(filename=filename, tsv_filename=tsv_filename,
+                           df_filename=join(work, 'df.npy'),
+                           n_jobs=cores, self_supervised=False, **tailored)
+    finally:
+        # the worker exits only when joblib's workers are gone
+        get_reusable_executor().shutdown(wait=True)
+    artifact = join(output, f'{model.identifier}.json.gz')
+    os.replace(filename, artifact)
+    _replace(sha256(artifact), f'{artifact}.sha256')
+    summary = dict(lang=lang, status='trained', artifact=artifact,
+                   digest=digest, cores=cores,
+                   seconds=perf_counter() - start, peak_rss=peak_rss())
+    _replace(json.dumps(summary), join(output, f'{model.identifier}.train.json'))
+    rmtree(work, ignore_errors=True)
+    return summary
+
+
+def _up_to_date(output: str, identifier: str, digest: str):
+    """Summary of the previous run when the artifact is up to date; otherwise None"""
+    manifest = join(output, f'{identifier}.train.json')
+    if not isfile(manifest):
+        return None
+    with open(manifest, encoding='utf-8') as fpt:
+        summary = json.load(fpt)
+    artifact = summary.get('artifact', '')
+    if summary.get('digest') != digest or not isfile(artifact):
+        return None
+    return summary
+
+
+def train(directory: str, output: str, langs: list=None,
+          n_jobs: int=-1, cores: int=None,
+          start_method: str='spawn', min_pos: int=32,
+          max_pos: int=int(2**21), max_per_class: int=None,
+          **kwargs):
+    """Train and calibrate a :py:class:`DialectId` for each language.
+    The languages run on a process pool that shares a global budget
+    of `n_jobs` cores, i.e., `n_jobs // cores` languages at a time, each
+    using `cores` cores. The artifacts, `output`/identifier.json.gz, are
+    skipped when the hash of the data and the parameters matches the
+    previous run (`output`/identifier.train.json); an interrupted run
+    is resumed from its intermediate files. It returns, for each
+    language, the status, training time (seconds), and peak memory
+    (bytes, resident set size of the worker).
+
+    :param directory: Datasets, `lang`.json[.gz] or a directory `lang` with JSON-lines files (text and klass)
+    :param output: Directory of the models; they can be loaded with `DialectId(lang=lang, model_dir=output)`
+    :param langs: Languages; default the languages of :py:data:`dialectid.utils.COUNTRIES` with more than one country and a dataset
+    :param n_jobs: Global budget of cores, -1 uses all the cores
+    :param cores: Cores of each language; default the budget divided among the languages
+    :param kwargs: Parameters of :py:class:`DialectId`, e.g., token_max_filter
+
+    >>> from dialectid.train import train
+    >>> train('datasets', 'models', langs=['es', 'en'], n_jobs=8)  # doctest: +SKIP
+    [{'lang': 'es', 'status': 'trained', ...}, {'lang': 'en', 'status': 'trained', ...}]
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    if langs is None:
+        langs = [k for k, v in COUNTRIES.items()
+                 if len(v) > 1 and len(dataset_files(directory, k))]
+    os.makedirs(output, exist_ok=True)
+    tailored = dict(min_pos=min_pos, max_pos=max_pos,
+                    max_per_class=max_per_class)
+    summaries = {}
+    pending = []
+    for lang in langs:
+        files = dataset_files(directory, lang)
+        if len(files) == 0:
+            summaries[lang] = dict(lang=lang, status='error: dataset not found')
+            continue
+        identifier = DialectId(lang=lang, pretrained=False, **kwargs).identifier
+        digest = content_hash(files, dict(identifier=identifier, **tailored))
+        summary = _up_to_date(output, identifier, digest)
+        if summary is not None:
+            summaries[lang] = dict(summary, status='up-to-date')
+            continue
+        size = sum(os.path.getsize(x) for x in files)
+        pending.append((size, lang, files, digest))
+    # largest datasets first
+    pending.sort(key=lambda x: x[0], reverse=True)
+    if len(pending):
+        if cores is None:
+            cores = max(n_jobs // len(pending), 1)
+        cores = min(cores, n_jobs)
+        context = mp.get_context(start_method)
+        options = dict()
+        # a new process per language, so peak_rss is the language's peak
+        if sys.version_info >= (3, 11) and start_method != 'fork':
+            options = dict(max_tasks_per_child=1)
+        with ProcessPoolExecutor(max_workers=max(n_jobs // cores, 1),
+                                 mp_context=context, **options) as executor:
+            futures = {executor.submit(_train, lang, files, output,
+                                       digest, cores, kwargs, tailored): lang
+                       for _, lang, files, digest in pending}
+            for future in as_completed(futures):
+                lang = futures[future]
+                try:
+                    summaries[lang] = future.result()
+                except Exception as error:
+                    summaries[lang] = dict(lang=lang, status=f'error: {error}')
+    return [summaries[lang] for lang in langs]
+
+
+def main(args=None):
+    """Command line interface to :py:func:`train`"""
+    import argparse
+    parser = argparse.ArgumentParser(description='Train DialectId for several languages')
+    parser.add_argument('directory', help='datasets: lang.json[.gz] or lang/*.json[.gz]')
+    parser.add_argument('-o', '--output', required=True, help='models directory')
+    parser.add_argument('-l', '--lang', nargs='+', default=None, dest='langs')
+    parser.add_argument('-n', '--n-jobs', type=int, default=-1, dest='n_jobs',
+                        help='global budget of cores')
+    parser.add_argument('-c', '--cores', type=int, default=None,
+                        help='cores of each language')
+    parser.add_argument('--max-per-class', type=int, default=None,
+                        dest='max_per_class')
+    parser.add_argument('--start-method', default='spawn', dest='start_method')
+    args = parser.parse_args(args)
+    output = train(args.directory, args.output, langs=args.langs,
+                   n_jobs=args.n_jobs, cores=args.cores,
+                   start_method=args.start_method,
+                   max_per_class=args.max_per_class)
+    for row in output:
+        print(json.dumps(row))
+    if any(x['status'].startswith('error') for x in output):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,6 +21,10 @@
 # SOFTWARE.
 # https://www.cia.gov/the-world-factbook/about/archives/2021/field/languages/
 
+from typing import Iterable
+from itertools import islice
+import random
+
 
 BASEURL = 'https://github.com/INGEOTEC/dialectid/releases/download/data'
 
@@ -93,4 +97,64 @@ COUNTRIES = {'es':['mx', 'cl', 'es', # Mexico (MX), Chile (CL), Spain (ES)
              'zh':['cn', 'sg', 'hk', # China, Singapore, Hong Kong
                    'tw' # Taiwan
              ]
-            }
\ No newline at end of file
+            }
+
+
+def batches(data: Iterable, batch_size: int=1024):
+    """Split an iterable into lists of, at most, `batch_size` elements
+
+    >>> from dialectid.utils import batches
+    >>> list(batches(range(5), batch_size=2))
+    [[0, 1], [2, 3], [4]]
+    """
+    assert batch_size > 0
+    data = iter(data)
+    while True:
+        batch = list(islice(data, batch_size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def reservoir(data: Iterable, size: int, key: str='klass',
+              seed: int=0):
+    """Uniform sample (reservoir sampling) of, at most, `size`
+    elements per class; `data` is read once.
+
+    >>> from dialectid.utils import reservoir
+    >>> D = [dict(klass=i % 2) for i in range(10)]
+    >>> len(reservoir(D, size=3))
+    6
+    """
+    rng = random.Random(seed)
+    sample = {}
+    seen = {}
+    for item in data:
+        label = item[key]
+        n = seen.get(label, 0)
+        seen[label] = n + 1
+        bucket = sample.setdefault(label, [])
+        if n < size:
+            bucket.append(item)
+            continue
+        index = rng.randrange(n + 1)
+        if index < size:
+            bucket[index] = item
+    return [item for label in sorted(sample) for item in sample[label]]
+
+
+def dataset_iterator(filename: str, tsv: bool=None):
+    """Labeled texts, i.e., dict with text and klass, stored in a TSV
+    file (labels, tab, text; the first label is the klass) or in a
+    JSON-lines file (optionally gzipped); `tsv` defaults to the
+    filename's extension."""
+    if tsv is None:
+        tsv = filename.endswith('.tsv')
+    if not tsv:
+        from microtc.utils import tweet_iterator
+        yield from tweet_iterator(filename)
+        return
+    with open(filename, encoding='utf-8') as fpt:
+        for line in fpt:
+            labels, text = line.rstrip('\n').split('\t', 1)
+            yield dict(text=text, klass=labels.split()[0])